@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Compare the `dedupe_strategy` options of `PhraseExtractionConfig`.
+
+Usage:
+    python scripts/benchmark_dedupe_strategies.py
+    python scripts/benchmark_dedupe_strategies.py --sizes 500,2000,8000 --cases 1000
+
+Checks every strategy in `DEDUPE_STRATEGIES` against its original pairwise
+implementation on randomized adversarial phrase lists and exits non-zero on the
+first differing keep/drop decision. Then, for synthetic corpora of increasing
+size, prints the ranked candidate count and, per strategy, the pairwise and
+indexed runtimes, the number of phrases kept and how many of them the default
+strategy keeps too (with the Jaccard overlap of the two sets).
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_phrases import synthesize_texts  # noqa: E402
+from check_phrase_dedupe import (  # noqa: E402
+    _is_phrase_subset,
+    random_phrases,
+    ranked_candidates,
+    reference_dedupe,
+)
+
+from imessage_wrapped.phrases import PhraseExtractionConfig, PhraseExtractor  # noqa: E402
+from imessage_wrapped.phrases.extractor_improved import DEDUPE_STRATEGIES  # noqa: E402
+
+
+def _overlap_pass(scored, overlap_tolerance):
+    filtered = []
+    for candidate in scored:
+        skip = False
+        for kept in filtered:
+            if kept.text in candidate.text or candidate.text in kept.text:
+                count_delta = abs(kept.occurrences - candidate.occurrences)
+                tolerance = max(1, int(kept.occurrences * overlap_tolerance))
+                if len(candidate.text) <= len(kept.text) and count_delta <= tolerance:
+                    skip = True
+                    break
+        if not skip:
+            filtered.append(candidate)
+    return filtered
+
+
+def reference_smart_subset(scored, overlap_tolerance=0.1):
+    filtered = _overlap_pass(scored, overlap_tolerance)
+    return [
+        phrase
+        for phrase in filtered
+        if not any(
+            phrase != other
+            and phrase.text != other.text
+            and _is_phrase_subset(phrase.text, other.text)
+            and phrase.occurrences / max(1, other.occurrences) < 0.8
+            for other in filtered
+        )
+    ]
+
+
+def reference_no_subset_removal(scored, overlap_tolerance=0.1):
+    return _overlap_pass(scored, overlap_tolerance)
+
+
+def reference_contextual(scored, overlap_tolerance=0.1, subset_threshold=1.5):
+    filtered = _overlap_pass(scored, overlap_tolerance)
+    return [
+        phrase
+        for phrase in filtered
+        if not any(
+            phrase != other
+            and phrase.text != other.text
+            and _is_phrase_subset(phrase.text, other.text)
+            and other.occurrences > phrase.occurrences * subset_threshold
+            for other in filtered
+        )
+    ]
+
+
+def reference_bidirectional(scored, overlap_tolerance=0.1):
+    filtered = []
+    for candidate in scored:
+        skip = False
+        for kept in filtered:
+            is_overlap = kept.text in candidate.text or candidate.text in kept.text
+            if is_overlap or _is_phrase_subset(candidate.text, kept.text):
+                count_delta = abs(kept.occurrences - candidate.occurrences)
+                tolerance = max(1, int(kept.occurrences * overlap_tolerance))
+                if len(candidate.text) <= len(kept.text) and count_delta <= tolerance:
+                    skip = True
+                    break
+        if not skip:
+            filtered.append(candidate)
+    return filtered
+
+
+# The original pairwise implementation of every strategy.
+REFERENCES = {
+    "default": reference_dedupe,
+    "smart_subset": reference_smart_subset,
+    "no_subset_removal": reference_no_subset_removal,
+    "contextual": reference_contextual,
+    "bidirectional": reference_bidirectional,
+}
+
+
+def timed(dedupe, scored, tolerance):
+    start = time.perf_counter()
+    kept = dedupe(scored, tolerance)
+    return kept, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--cases", type=int, default=500, help="Randomized phrase lists")
+    parser.add_argument(
+        "--sizes", default="500,1000,2000,4000", help="Comma-separated corpus sizes (messages)"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.2, help="overlap_tolerance")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    for case in range(args.cases):
+        phrases = random_phrases(rng)
+        tolerance = rng.choice([0.0, 0.1, 0.2, 0.5])
+        for name, dedupe in DEDUPE_STRATEGIES.items():
+            if dedupe(phrases, tolerance) != REFERENCES[name](phrases, tolerance):
+                print(f"❌ {name}: differs from the pairwise implementation on case {case}")
+                sys.exit(1)
+    print(f"✅ {len(DEDUPE_STRATEGIES)} strategies match on {args.cases} randomized phrase lists\n")
+
+    extractor = PhraseExtractor(config=PhraseExtractionConfig(min_occurrences=2))
+    print(
+        f"{'messages':>8} {'candidates':>10}  {'strategy':<18} {'pairwise':>9} {'indexed':>9}"
+        f" {'kept':>6} {'shared':>7} {'jaccard':>8}"
+    )
+    print("─" * 84)
+    for size in (int(value) for value in args.sizes.split(",")):
+        scored = ranked_candidates(extractor, synthesize_texts(size, seed=size))
+        default = {item.text for item in DEDUPE_STRATEGIES["default"](scored, args.tolerance)}
+        for name, dedupe in DEDUPE_STRATEGIES.items():
+            expected, reference_seconds = timed(REFERENCES[name], scored, args.tolerance)
+            kept, seconds = timed(dedupe, scored, args.tolerance)
+            if kept != expected:
+                print(f"❌ {name}: differs from the pairwise implementation at {size} messages")
+                sys.exit(1)
+            texts = {item.text for item in kept}
+            shared = len(texts & default)
+            jaccard = shared / max(1, len(texts | default))
+            print(
+                f"{size:>8,} {len(scored):>10,}  {name:<18} {reference_seconds:>8.3f}s"
+                f" {seconds:>8.3f}s {len(kept):>6,} {shared:>7,} {jaccard:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
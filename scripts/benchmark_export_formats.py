@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark export formats: file size, write time and load time.
+
+Usage:
+    python scripts/benchmark_export_formats.py exports/imessage_export_2025.jsonl
+    python scripts/benchmark_export_formats.py --synthetic 200000
+
+Loads (or synthesizes) one export, then writes and reads it back with every
+serializer and prints a comparison table.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from imessage_wrapped.exporter import (  # noqa: E402
+    ColumnarSerializer,
+    Exporter,
+    JSONLSerializer,
+    JSONSerializer,
+)
+from imessage_wrapped.loader import ExportLoader  # noqa: E402
+from imessage_wrapped.models import Conversation, ExportData, Message, Tapback  # noqa: E402
+
+FORMATS = [
+    ("jsonl (v1)", ".jsonl", lambda: JSONLSerializer(schema_version=1)),
+    ("jsonl (v2)", ".jsonl", JSONLSerializer),
+    ("json", ".json", lambda: JSONSerializer(indent=None)),
+    ("columnar", ".iwc", ColumnarSerializer),
+]
+
+
+def synthesize(message_count: int, seed: int = 7) -> ExportData:
+    """Build an export with a realistic mix of 1:1 and group conversations."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    conversations = {}
+    remaining = message_count
+    chat_id = 0
+    while remaining > 0:
+        chat_id += 1
+        is_group = rng.random() < 0.25
+        participants = [
+            f"+1555{rng.randrange(10**7):07d}" for _ in range(rng.randint(3, 9) if is_group else 1)
+        ]
+        size = min(remaining, int(rng.paretovariate(1.2) * 40))
+        remaining -= size
+        timestamp = start + timedelta(seconds=rng.randrange(86400 * 30))
+        messages = []
+        for idx in range(size):
+            timestamp += timedelta(seconds=int(rng.expovariate(1 / 1800)))
+            from_me = rng.random() < 0.45
+            messages.append(
+                Message(
+                    id=chat_id * 100_000 + idx,
+                    guid=f"{rng.getrandbits(64):016X}-{chat_id}-{idx}",
+                    timestamp=timestamp,
+                    is_from_me=from_me,
+                    sender="me" if from_me else rng.choice(participants),
+                    text=None,
+                    service="iMessage",
+                    has_attachment=rng.random() < 0.05,
+                    date_read_after_seconds=rng.random() * 600 if rng.random() < 0.3 else None,
+                    tapbacks=[Tapback(type="love", by=rng.choice(participants))]
+                    if rng.random() < 0.08
+                    else [],
+                    text_length=rng.randint(1, 120),
+                    word_count=rng.randint(1, 25),
+                    punctuation_count=rng.randint(0, 4),
+                    has_question=rng.random() < 0.15,
+                    has_exclamation=rng.random() < 0.2,
+                    has_link=rng.random() < 0.02,
+                    emoji_counts={"😂": rng.randint(1, 3)} if rng.random() < 0.1 else {},
+                )
+            )
+        conversations[f"chat_{chat_id}"] = Conversation(
+            chat_id=chat_id,
+            chat_identifier=f"chat{chat_id}" if is_group else participants[0],
+            display_name=f"Group {chat_id}" if is_group else None,
+            is_group_chat=is_group,
+            participants=participants,
+            messages=messages,
+        )
+    return ExportData(
+        export_date=datetime.now(timezone.utc),
+        year=2025,
+        conversations=conversations,
+        phrases={"overall": [{"phrase": f"phrase {i}", "occurrences": 50 - i} for i in range(25)]},
+        sentiment={"overall": {"positive": 0.4, "neutral": 0.4, "negative": 0.2}},
+    )
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("export", nargs="?", help="Existing export to benchmark with")
+    parser.add_argument("--synthetic", type=int, default=100_000, help="Messages to synthesize")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing (default: 3)")
+    args = parser.parse_args()
+
+    if args.export:
+        print(f"📂 Loading {args.export}...")
+        data = ExportLoader.load(args.export)
+    else:
+        print(f"🧪 Synthesizing {args.synthetic:,} messages...")
+        data = synthesize(args.synthetic)
+    print(f"   {data.total_messages:,} messages in {len(data.conversations):,} conversations\n")
+
+    # Loaders don't restore chat ids, so compare against a reference without them.
+    reference = asdict(data)
+    for conv in reference["conversations"].values():
+        conv["chat_id"] = 0
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for label, suffix, make_serializer in FORMATS:
+            path = Path(tmpdir) / f"export{suffix}"
+            exporter = Exporter(serializer=make_serializer())
+            write_time = min(
+                timed(lambda: exporter.export_to_file(data, path))[1] for _ in range(args.repeat)
+            )
+            load_time = float("inf")
+            for _ in range(args.repeat):
+                loaded, elapsed = timed(lambda: ExportLoader.load(path))
+                load_time = min(load_time, elapsed)
+            matches = asdict(loaded) == reference
+            rows.append((label, path.stat().st_size, write_time, load_time, matches))
+
+    _, baseline_size, _, baseline_load, _ = rows[0]
+    print(
+        f"{'format':<12} {'size':>12} {'ratio':>7} {'write':>9} {'load':>9} {'speedup':>8}  round-trip"
+    )
+    print("─" * 72)
+    for label, size, write_time, load_time, matches in rows:
+        print(
+            f"{label:<12} {size / 1024 / 1024:>10.2f}MB {size / baseline_size:>7.2f} "
+            f"{write_time:>8.3f}s {load_time:>8.3f}s {baseline_load / load_time:>7.1f}x  "
+            f"{'✓' if matches else '✗'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark the JSONL loader's per-message hot path.
+
+Usage:
+    python scripts/benchmark_loader.py                     # 1M synthetic messages
+    python scripts/benchmark_loader.py --messages 200000
+    python scripts/benchmark_loader.py exports/imessage_export_2025.jsonl
+
+Times an end-to-end `ExportLoader.load`, then splits the per-message cost into
+JSON decoding and `Message` construction and compares timestamp strategies:
+`datetime.fromisoformat` on the ISO string (what the loader uses) against
+rebuilding the datetime from `timestamp_unix` with a cached tz object.
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_export_formats import synthesize  # noqa: E402
+
+from imessage_wrapped.exporter import Exporter, JSONLSerializer  # noqa: E402
+from imessage_wrapped.loader import ExportLoader, _parse_message  # noqa: E402
+from imessage_wrapped.models import Message, Tapback  # noqa: E402
+
+BATCH_LINES = 100_000
+_UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_message_previous(msg_data):
+    """The loader's message construction before the empty-field fast path."""
+    return Message(
+        id=msg_data["id"],
+        guid=msg_data["guid"],
+        timestamp=datetime.fromisoformat(msg_data["timestamp"]),
+        is_from_me=msg_data["is_from_me"],
+        sender=msg_data["sender"],
+        text=msg_data.get("text"),
+        service=msg_data["service"],
+        has_attachment=msg_data["has_attachment"],
+        date_read_after_seconds=msg_data.get("date_read_after_seconds"),
+        tapbacks=[Tapback(type=tb["type"], by=tb["by"]) for tb in msg_data.get("tapbacks", [])],
+        text_length=msg_data.get("text_length", 0),
+        word_count=msg_data.get("word_count", 0),
+        punctuation_count=msg_data.get("punctuation_count", 0),
+        has_question=msg_data.get("has_question", False),
+        has_exclamation=msg_data.get("has_exclamation", False),
+        has_link=msg_data.get("has_link", False),
+        emoji_counts=msg_data.get("emoji_counts", {}) or {},
+    )
+
+
+def timestamp_from_iso(msg_data):
+    return datetime.fromisoformat(msg_data["timestamp"])
+
+
+def timestamp_from_unix(msg_data, _epochs={}):
+    # timestamp_unix is whole seconds; microseconds still have to come from the string.
+    iso = msg_data["timestamp"]
+    suffix = iso[-6:]
+    epoch = _epochs.get(suffix)
+    if epoch is None:
+        epoch = _epochs[suffix] = _UTC_EPOCH.astimezone(datetime.fromisoformat(iso).tzinfo)
+    micros = int(iso[20:26]) if iso[19] == "." else 0
+    return epoch + timedelta(seconds=msg_data["timestamp_unix"], microseconds=micros)
+
+
+def iter_batches(path):
+    batch = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            batch.append(line)
+            if len(batch) == BATCH_LINES:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def time_stage(path, stage, repeat):
+    """Best-of-N total time of ``stage(decoded_messages)`` over every batch."""
+    best = float("inf")
+    for _ in range(repeat):
+        total = 0.0
+        for lines in iter_batches(path):
+            records = [json.loads(line) for line in lines]
+            messages = [
+                r if r.get("type") == "message" else r["message"]
+                for r in records
+                if r.get("type") in ("message", None)
+            ]
+            del records
+            gc.collect()
+            start = time.perf_counter()
+            stage(messages)
+            total += time.perf_counter() - start
+        best = min(best, total)
+    return best
+
+
+def time_decode(path, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        total = 0.0
+        for lines in iter_batches(path):
+            start = time.perf_counter()
+            for line in lines:
+                json.loads(line)
+            total += time.perf_counter() - start
+        best = min(best, total)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("export", nargs="?", help="Existing JSONL export to benchmark with")
+    parser.add_argument("--messages", type=int, default=1_000_000, help="Messages to synthesize")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing (default: 3)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if args.export:
+            path = Path(args.export)
+        else:
+            print(f"🧪 Synthesizing {args.messages:,} messages...")
+            path = Path(tmpdir) / "export.jsonl"
+            data = synthesize(args.messages)
+            Exporter(serializer=JSONLSerializer()).export_to_file(data, path)
+            del data
+            gc.collect()
+
+        lines = sum(1 for _ in open(path, "rb"))
+        print(f"   {path.name}: {lines:,} lines, {path.stat().st_size / 1024 / 1024:.1f} MB\n")
+
+        load_time = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            loaded = ExportLoader.load(path)
+            load_time = min(load_time, time.perf_counter() - start)
+            del loaded
+            gc.collect()
+
+        rows = [
+            ("ExportLoader.load (end to end)", load_time),
+            ("json decode only", time_decode(path, args.repeat)),
+            (
+                "Message build (previous)",
+                time_stage(path, lambda ms: [parse_message_previous(m) for m in ms], args.repeat),
+            ),
+            (
+                "Message build (current)",
+                time_stage(path, lambda ms: [_parse_message(m) for m in ms], args.repeat),
+            ),
+            (
+                "timestamp: fromisoformat",
+                time_stage(path, lambda ms: [timestamp_from_iso(m) for m in ms], args.repeat),
+            ),
+            (
+                "timestamp: timestamp_unix + tz",
+                time_stage(path, lambda ms: [timestamp_from_unix(m) for m in ms], args.repeat),
+            ),
+        ]
+
+    print(f"{'stage':<34} {'total':>9} {'per msg':>10}")
+    print("─" * 56)
+    for label, seconds in rows:
+        print(f"{label:<34} {seconds:>8.2f}s {seconds / lines * 1e6:>8.2f}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark phrase extraction on synthetic conversational text.
+
+Usage:
+    python scripts/benchmark_phrases.py
+    python scripts/benchmark_phrases.py --messages 200000 --repeat 3
+
+Synthesizes short messages from a Zipf-distributed vocabulary sprinkled with
+recurring catch-phrases, then times tokenization, n-gram counting (level-wise
+and single pass) and the full `PhraseExtractor.extract` call with both engines
+and prints the top phrases found. Use ``--vocabulary`` to add rare words: level-wise counting only
+pays off once most long n-grams fall below ``min_occurrences``.
+"""
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from imessage_wrapped.phrases import PhraseExtractor  # noqa: E402
+
+WORDS = (
+    "i you the a to and it that is of in so my me we lol on for be just have this "
+    "not what was it's but with are at like do get can go if yeah ok okay no know "
+    "think good love want will up out now how all about oh time one see really going "
+    "haha home tonight tomorrow work later dinner come back call need wait sure right "
+    "friday coffee movie game weekend pizza gym class meeting train car dog beach "
+    "https link photo 2 10 30 omg wow nice cool funny sorry thanks thank babe dude"
+).split()
+CATCH_PHRASES = [
+    "on my way",
+    "sounds good",
+    "love you",
+    "see you soon",
+    "talk to you later",
+    "what are you doing",
+    "let me know",
+    "no worries",
+    "oh my god",
+    "i miss you",
+    "happy birthday",
+    "are you home",
+]
+
+
+def synthesize_texts(message_count: int, seed: int = 11, vocabulary: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    words_list = list(WORDS) + [f"word{index}" for index in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(len(words_list))]
+    texts = []
+    for _ in range(message_count):
+        words = rng.choices(words_list, weights, k=rng.randint(1, 14))
+        if rng.random() < 0.3:
+            position = rng.randrange(len(words) + 1)
+            words[position:position] = rng.choice(CATCH_PHRASES).split()
+        text = " ".join(words)
+        if rng.random() < 0.4:
+            text += rng.choice("?!.")
+        texts.append(text.capitalize())
+    return texts
+
+
+def best_of(repeat, fn):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--messages", type=int, default=100_000, help="Messages to synthesize")
+    parser.add_argument(
+        "--vocabulary", type=int, default=0, help="Extra rare words to draw from (default: 0)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing (default: 3)")
+    args = parser.parse_args()
+
+    texts = synthesize_texts(args.messages, vocabulary=args.vocabulary)
+    extractor = PhraseExtractor()
+    single_pass = PhraseExtractor(config=replace(extractor.config, levelwise_counting=False))
+    tokenizer = extractor._tokenizer
+    print(f"🧪 {len(texts):,} synthetic messages\n")
+
+    tokenized, tokenize_time = best_of(args.repeat, lambda: tokenizer.tokenize_messages(texts))
+    (counts, _, _), count_time = best_of(
+        args.repeat,
+        lambda: extractor._count_phrases(
+            tokenized, min_occurrences=extractor.config.min_occurrences
+        ),
+    )
+    _, single_pass_time = best_of(
+        args.repeat,
+        lambda: single_pass._count_phrases(
+            tokenized, min_occurrences=extractor.config.min_occurrences
+        ),
+    )
+    result, extract_time = best_of(args.repeat, lambda: extractor.extract(texts))
+    suffix_array = PhraseExtractor(config=replace(extractor.config, engine="suffix_array"))
+    repeats, repeats_time = best_of(args.repeat, lambda: suffix_array.extract(texts))
+
+    print(f"{'stage':<24} {'time':>9}")
+    print("─" * 34)
+    print(f"{'tokenize':<24} {tokenize_time:>8.3f}s")
+    print(f"{'count n-grams':<24} {count_time:>8.3f}s")
+    print(f"{'  single pass':<24} {single_pass_time:>8.3f}s")
+    print(f"{'extract (end to end)':<24} {extract_time:>8.3f}s")
+    print(f"{'  suffix_array engine':<24} {repeats_time:>8.3f}s")
+    print(f"\n{len(counts):,} phrases above min_occurrences; top {len(result.overall)}:")
+    for stat in result.overall:
+        print(f"  {stat.occurrences:>7,}  {stat.text}")
+    print(f"\nsuffix_array engine, top {len(repeats.overall)}:")
+    for stat in repeats.overall:
+        print(f"  {stat.occurrences:>7,}  {stat.text}")
+
+
+if __name__ == "__main__":
+    main()
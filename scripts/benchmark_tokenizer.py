@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark `SimpleTokenizer` throughput against the original implementation.
+
+Usage:
+    python scripts/benchmark_tokenizer.py
+    python scripts/benchmark_tokenizer.py --messages 500000 --repeat 5
+
+Checks that `tokenize` and `sentences` match the original character-by-character
+normalization on synthetic messages plus non-ASCII edge cases (curly quotes,
+emoji, exotic whitespace, characters that lowercase to ASCII), exits non-zero on
+the first difference, then prints throughput for both.
+"""
+
+import argparse
+import random
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_phrases import best_of, synthesize_texts  # noqa: E402
+
+from imessage_wrapped.phrases.tokenizer import SimpleTokenizer  # noqa: E402
+
+EDGE_CASES = [
+    "",
+    "   ",
+    "I’m on my way — don‘t wait",
+    "itʼs 5′ away",
+    "K is a kelvin sign, İstanbul has a dotted I",
+    "café naïve ÜBER straße",
+    "lol \U0001f602\U0001f602 ok cool see\tyou\nsoon",
+    "WAIT!!! what?? ok... fine.",
+    "'quoted' ''' ’’",
+    "Ｈｉ fullwidth letters",
+]
+
+
+class ReferenceTokenizer:
+    """`SimpleTokenizer` before the translate/ASCII fast path."""
+
+    _word = re.compile(r"[A-Za-z0-9']+")
+    _boundary = re.compile(r"[.!?]+")
+    _apostrophes = {"‘": "'", "’": "'", "′": "'", "ʼ": "'"}
+
+    def tokenize(self, text):
+        normalized = self._normalize(text)
+        return [match.group(0).lower() for match in self._word.finditer(normalized)]
+
+    def sentences(self, text):
+        normalized = self._normalize(text)
+        start = 0
+        for match in self._boundary.finditer(normalized):
+            chunk = normalized[start : match.start()].strip()
+            if chunk:
+                yield chunk
+            start = match.end()
+        remainder = normalized[start:].strip()
+        if remainder:
+            yield remainder
+
+    def _normalize(self, text):
+        normalized = "".join(self._apostrophes.get(ch, ch) for ch in text)
+        normalized = re.sub(r"\s+", " ", normalized)
+        return normalized.strip()
+
+
+def corpus(message_count):
+    rng = random.Random(5)
+    texts = synthesize_texts(message_count)
+    # Sprinkle non-ASCII into a share of messages so both paths are exercised.
+    for index in range(0, len(texts), 7):
+        texts[index] = texts[index].replace("'", "’") + " " + rng.choice(EDGE_CASES)
+    return texts + EDGE_CASES
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--messages", type=int, default=200_000, help="Messages to synthesize")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing (default: 3)")
+    args = parser.parse_args()
+
+    texts = corpus(args.messages)
+    reference, tokenizer = ReferenceTokenizer(), SimpleTokenizer()
+    for text in texts:
+        if tokenizer.tokenize(text) != reference.tokenize(text) or list(
+            tokenizer.sentences(text)
+        ) != list(reference.sentences(text)):
+            print(f"❌ tokenizer output differs for {text!r}")
+            sys.exit(1)
+    ascii_share = sum(text.isascii() for text in texts) / len(texts)
+    print(f"✅ {len(texts):,} messages tokenize identically ({ascii_share:.0%} ASCII)\n")
+
+    print(f"{'tokenizer':<12} {'time':>9} {'messages/s':>14}")
+    print("─" * 37)
+    for label, impl in (("original", reference), ("current", tokenizer)):
+        _, seconds = best_of(args.repeat, lambda: [impl.tokenize(text) for text in texts])
+        print(f"{label:<12} {seconds:>8.3f}s {len(texts) / seconds:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
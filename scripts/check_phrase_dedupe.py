@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Check `dedupe_overlaps` against the original pairwise implementation.
+
+Usage:
+    python scripts/check_phrase_dedupe.py
+    python scripts/check_phrase_dedupe.py --cases 2000 --messages 5000
+
+Runs both on randomized adversarial phrase lists (tiny alphabets, so phrases
+overlap inside words and at odd offsets) and on the ranked candidates of
+synthetic message buckets, fails on the first differing keep/drop decision,
+then times both on the largest bucket.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_phrases import synthesize_texts  # noqa: E402
+
+from imessage_wrapped.phrases import PhraseExtractionConfig, PhraseExtractor  # noqa: E402
+from imessage_wrapped.phrases.dedupe import dedupe_overlaps  # noqa: E402
+from imessage_wrapped.phrases.scoring import ScoredPhrase  # noqa: E402
+
+
+def reference_dedupe(scored, overlap_tolerance):
+    """The original all-pairs `PhraseExtractor._dedupe_overlaps`."""
+    filtered = []
+    for candidate in scored:
+        skip = False
+        for kept in filtered:
+            if kept.text in candidate.text or candidate.text in kept.text:
+                count_delta = abs(kept.occurrences - candidate.occurrences)
+                tolerance = max(1, int(kept.occurrences * overlap_tolerance))
+                if len(candidate.text) <= len(kept.text) and count_delta <= tolerance:
+                    skip = True
+                    break
+        if not skip:
+            filtered.append(candidate)
+
+    result = []
+    for phrase in filtered:
+        is_subset = False
+        for other in filtered:
+            if phrase != other and phrase.text != other.text:
+                if _is_phrase_subset(phrase.text, other.text):
+                    is_subset = True
+                    break
+        if not is_subset:
+            result.append(phrase)
+    return result
+
+
+def _is_phrase_subset(shorter, longer):
+    if len(shorter) >= len(longer):
+        return False
+    shorter_words = shorter.split()
+    longer_words = longer.split()
+    if len(shorter_words) > len(longer_words):
+        return False
+    for i in range(len(longer_words) - len(shorter_words) + 1):
+        if longer_words[i : i + len(shorter_words)] == shorter_words:
+            return True
+    return False
+
+
+def random_phrases(rng):
+    words = ["a", "b", "ab", "ba", "aab", "bb", "abba"]
+    phrases = []
+    for _ in range(rng.randint(0, 40)):
+        text = " ".join(rng.choices(words, k=rng.randint(1, 4)))
+        if rng.random() < 0.05:
+            text = rng.choice(["", " ", "a  b", " ab"])
+        phrases.append(
+            ScoredPhrase(text=text, occurrences=rng.randint(1, 30), score=rng.random() * 10)
+        )
+    return phrases
+
+
+def ranked_candidates(extractor, texts):
+    tokenized = extractor._tokenizer.tokenize_messages(texts)
+    counts, doc_frequencies, total = extractor._count_phrases(
+        tokenized, min_occurrences=extractor.config.min_occurrences
+    )
+    scored = extractor._scorer.score(counts, doc_frequencies, total)
+    return sorted(
+        scored,
+        key=lambda item: (
+            item.score * extractor._length_multiplier(item.text),
+            item.occurrences,
+            len(item.text),
+            item.text,
+        ),
+        reverse=True,
+    )
+
+
+def check(scored, tolerance, label):
+    expected = reference_dedupe(scored, tolerance)
+    actual = dedupe_overlaps(scored, tolerance)
+    if actual != expected:
+        print(f"❌ {label}: {len(actual)} kept vs {len(expected)} expected")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--cases", type=int, default=500, help="Randomized phrase lists")
+    parser.add_argument("--messages", type=int, default=3000, help="Largest synthetic bucket")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    for case in range(args.cases):
+        phrases = random_phrases(rng)
+        check(phrases, rng.choice([0.0, 0.1, 0.2, 0.5]), f"random case {case}")
+    print(f"✅ {args.cases} randomized phrase lists match")
+
+    extractor = PhraseExtractor(config=PhraseExtractionConfig(min_occurrences=2))
+    sizes = sorted({min(size, args.messages) for size in (100, 500, 1000, args.messages)})
+    for size in sizes:
+        texts = synthesize_texts(size, seed=size)
+        for tolerance in (0.1, 0.2):
+            check(ranked_candidates(extractor, texts), tolerance, f"{size} messages")
+    print(f"✅ synthetic buckets of {', '.join(map(str, sizes))} messages match")
+
+    scored = ranked_candidates(extractor, synthesize_texts(args.messages, seed=args.messages))
+    for label, dedupe in (("pairwise", reference_dedupe), ("indexed", dedupe_overlaps)):
+        start = time.perf_counter()
+        kept = dedupe(scored, 0.2)
+        print(
+            f"   {label:<9} {time.perf_counter() - start:>8.3f}s  {len(scored):,} → {len(kept):,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
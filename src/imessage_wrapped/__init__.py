@@ -5,11 +5,12 @@ from .analyzer import (
 )
 from .contacts import ContactsReader, check_contacts_access, enrich_conversations_with_contacts
 from .displays import Display, TerminalDisplay
-from .exporter import Exporter, JSONLSerializer, JSONSerializer
-from .loader import ExportLoader
+from .exporter import ColumnarSerializer, Exporter, JSONLSerializer, JSONSerializer
+from .loader import ExportLoader, MessageFilter
 from .models import Conversation, ExportData, Message, Tapback
 from .permissions import PermissionError, check_database_access, require_database_access
 from .service import MessageService
+from .token_streams import TokenVocabulary
 
 __all__ = [
     "Message",
@@ -20,10 +21,13 @@ __all__ = [
     "Exporter",
     "JSONSerializer",
     "JSONLSerializer",
+    "ColumnarSerializer",
     "check_database_access",
     "require_database_access",
     "PermissionError",
     "ExportLoader",
+    "MessageFilter",
+    "TokenVocabulary",
     "StatisticsAnalyzer",
     "RawStatisticsAnalyzer",
     "NLPStatisticsAnalyzer",
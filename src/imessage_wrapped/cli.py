@@ -1,5 +1,6 @@
 import argparse
 import logging
+import sqlite3
 import sys
 from pathlib import Path
 
@@ -26,8 +27,19 @@ from . import (
     TerminalDisplay,
     require_database_access,
 )
+from .export_cache import (
+    EXTEND,
+    REBUILD,
+    REUSE,
+    CachePlan,
+    extend_export,
+    fingerprint_database,
+    plan_export,
+)
 from .phrase_utils import compute_phrases_for_export
 from .sentiment_utils import compute_sentiment_for_export
+from .streams import is_export_file
+from .token_streams import TokenVocabulary, attach_token_ids, vocabulary_path_for
 from .utils import sanitize_statistics_for_export
 
 logger = logging.getLogger(__name__)
@@ -65,9 +77,16 @@ def parse_args():
     parser.add_argument(
         "--format",
         type=str,
-        choices=["jsonl", "json"],
+        choices=["jsonl", "json", "columnar"],
         default="jsonl",
-        help="Export format (default: jsonl)",
+        help="Export format (default: jsonl; columnar is a compact binary .iwc file)",
+    )
+
+    parser.add_argument(
+        "--compress",
+        type=str,
+        choices=["gzip", "zstd"],
+        help="Compress the export stream (appends .gz/.zst to the default output name)",
     )
 
     parser.add_argument(
@@ -92,7 +111,26 @@ def parse_args():
     parser.add_argument(
         "--replace-cache",
         action="store_true",
-        help="Replace existing cached export file if it exists",
+        help="Rebuild the cached export even if it is up to date with chat.db",
+    )
+
+    parser.add_argument(
+        "--token-ids",
+        action="store_true",
+        help="Store word token ids in the export and their vocabulary in a local "
+        "<export>.vocab.json file, so phrases can be recomputed without chat.db",
+    )
+
+    parser.add_argument(
+        "--hash-tokens",
+        action="store_true",
+        help="Like --token-ids, but derive ids from a salted hash kept only in the vocabulary file",
+    )
+
+    parser.add_argument(
+        "--recompute-phrases",
+        action="store_true",
+        help="Recompute phrases from the export's token ids instead of using the stored summary",
     )
 
     parser.add_argument(
@@ -191,54 +229,113 @@ def export_command(args):
     if args.output:
         output_path = args.output
     else:
-        ext = "jsonl" if args.format == "jsonl" else "json"
-        output_path = f"exports/imessage_export_{args.year}.{ext}"
+        ext = {"jsonl": "jsonl", "json": "json", "columnar": "iwc"}[args.format]
+        compress = {None: "", "gzip": ".gz", "zstd": ".zst"}[getattr(args, "compress", None)]
+        output_path = f"exports/imessage_export_{args.year}.{ext}{compress}"
 
     output_file = Path(output_path)
-
-    if output_file.exists() and not args.replace_cache:
-        console.print(f"\n[yellow]ℹ[/] Export file already exists: [cyan]{output_path}[/]")
+    with_contacts = getattr(args, "with_contacts", False)
+    hash_tokens = getattr(args, "hash_tokens", False)
+    store_tokens = getattr(args, "token_ids", False) or hash_tokens
+    vocabulary_path = vocabulary_path_for(output_file)
+
+    try:
+        if args.replace_cache:
+            plan = CachePlan(
+                REBUILD,
+                fingerprint_database(args.database, with_contacts=with_contacts),
+                "--replace-cache",
+            )
+        else:
+            plan = plan_export(output_file, args.database, with_contacts=with_contacts)
+    except (OSError, sqlite3.Error) as e:
+        if not output_file.exists():
+            raise
+        logger.warning(f"Could not validate cached export against chat.db: {e}")
+        plan = None
+
+    # Cached messages can't be given (or re-keyed to) token ids without their text.
+    if store_tokens and plan is not None and plan.action != REBUILD:
+        if not vocabulary_path.exists():
+            plan = CachePlan(REBUILD, plan.fingerprint, "cached export has no token ids")
+        elif hash_tokens and not TokenVocabulary.load(vocabulary_path).hashed:
+            plan = CachePlan(REBUILD, plan.fingerprint, "cached export has unhashed token ids")
+
+    if plan is None or plan.action == REUSE:
+        reason = f" ({plan.reason})" if plan else ""
+        console.print(f"\n[yellow]ℹ[/] Export file is up to date: [cyan]{output_path}[/]{reason}")
         console.print("[dim]Use --replace-cache to regenerate[/]")
         return output_path, None
 
-    with_contacts = getattr(args, "with_contacts", False)
-
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         console=console,
     ) as progress:
-        task = progress.add_task(f"Exporting messages from {args.year}...", total=None)
-
         service = MessageService(db_path=args.database, with_contacts=with_contacts)
-        data = service.export_year(args.year)
+        if plan.action == EXTEND:
+            assert plan.cached is not None, "EXTEND plans carry the cached fingerprint"
+            task = progress.add_task(f"Updating export with {plan.reason}...", total=None)
+            cached = ExportLoader.load(output_file, workers=None)
+            delta = service.export_year(
+                args.year, after_rowid=plan.cached.max_rowid, max_rowid=plan.fingerprint.max_rowid
+            )
+            vocabulary = TokenVocabulary.load(vocabulary_path) if vocabulary_path.exists() else None
+            if vocabulary is not None:
+                attach_token_ids(delta, vocabulary)
+            # Phrase and sentiment summaries need every message's text; keep the cached ones
+            # unless token ids let phrases be recomputed.
+            data = extend_export(cached, delta)
+            if vocabulary is not None:
+                phrases, _ = compute_phrases_for_export(data, vocabulary=vocabulary)
+                data.phrases = phrases or None
+        else:
+            task = progress.add_task(f"Exporting messages from {args.year}...", total=None)
+            data = service.export_year(args.year, max_rowid=plan.fingerprint.max_rowid)
 
-        # Precompute phrases while text is available; stored alongside export without raw text.
-        phrases, phrases_by_contact = compute_phrases_for_export(data)
-        data.phrases = phrases or None
-        # Per-contact phrases are intentionally omitted from export for privacy.
-        data.phrases_by_contact = None
+            # Precompute phrases while text is available; stored alongside export without raw text.
+            phrases, phrases_by_contact = compute_phrases_for_export(data)
+            data.phrases = phrases or None
+            # Per-contact phrases are intentionally omitted from export for privacy.
+            data.phrases_by_contact = None
 
-        # Precompute sentiment (overall + monthly) while text is available.
-        data.sentiment = compute_sentiment_for_export(data) or None
+            # Precompute sentiment (overall + monthly) while text is available.
+            data.sentiment = compute_sentiment_for_export(data) or None
+
+            vocabulary = None
+            if store_tokens:
+                vocabulary = TokenVocabulary.salted() if hash_tokens else TokenVocabulary()
+                attach_token_ids(data, vocabulary)
+        data.source = plan.fingerprint.to_dict()
 
         progress.update(task, description=f"Writing {data.total_messages} messages to file...")
 
-        from .exporter import JSONLSerializer, JSONSerializer
+        from .exporter import ColumnarSerializer, JSONLSerializer, JSONSerializer
 
         # Keep exports lightweight; analysis can reuse in-memory data without persisting message text.
         if args.format == "json":
             serializer = JSONSerializer(indent=args.indent if args.indent > 0 else None)
+        elif args.format == "columnar":
+            serializer = ColumnarSerializer()
         else:
             serializer = JSONLSerializer()
         exporter = Exporter(serializer=serializer)
         exporter.export_to_file(data, output_path)
+        if vocabulary is not None:
+            vocabulary.save(vocabulary_path)
+        else:
+            vocabulary_path.unlink(missing_ok=True)
 
     console.print(
         f"\n[green]✓[/] Exported {data.total_messages} messages to [cyan]{output_path}[/]"
     )
     console.print(f"[dim]Conversations: {len(data.conversations)}[/]")
+    if vocabulary is not None:
+        console.print(f"[dim]Token vocabulary (keep private): {vocabulary_path}[/]")
 
+    if plan.action == EXTEND:
+        # New messages still carry text the cached ones don't; analyze the file instead.
+        return output_path, None
     return output_path, data
 
 
@@ -265,7 +362,7 @@ def analyze_command(args, input_path=None, preloaded_data=None):
 
         if exports_dir.exists():
             export_files = sorted(
-                [f for f in exports_dir.iterdir() if f.suffix in [".json", ".jsonl"]],
+                [f for f in exports_dir.iterdir() if f.is_file() and is_export_file(f)],
                 key=lambda x: x.stat().st_mtime,
                 reverse=True,
             )
@@ -290,7 +387,7 @@ def analyze_command(args, input_path=None, preloaded_data=None):
                 sys.exit(1)
 
             export_files = sorted(
-                [f for f in exports_dir.iterdir() if f.suffix in [".json", ".jsonl"]],
+                [f for f in exports_dir.iterdir() if f.is_file() and is_export_file(f)],
                 key=lambda x: x.stat().st_mtime,
                 reverse=True,
             )
@@ -331,13 +428,26 @@ def analyze_command(args, input_path=None, preloaded_data=None):
         load_task = progress.add_task("Loading export data...", total=1)
 
         try:
-            data = preloaded_data or ExportLoader.load(input_path)
+            data = preloaded_data or ExportLoader.load(input_path, workers=None)
         except Exception as e:
             console.print(f"[red]✗[/] Failed to load export data: {e}")
             sys.exit(1)
 
         progress.update(load_task, advance=1, description="Export loaded")
 
+        vocabulary = None
+        vocabulary_path = vocabulary_path_for(input_path)
+        if vocabulary_path.exists():
+            try:
+                vocabulary = TokenVocabulary.load(vocabulary_path)
+            except (OSError, ValueError) as e:
+                console.print(f"[yellow]⚠[/] Ignoring token vocabulary {vocabulary_path}: {e}")
+        if getattr(args, "recompute_phrases", False):
+            if vocabulary is None:
+                console.print(f"[red]✗[/] --recompute-phrases needs {vocabulary_path}")
+                sys.exit(1)
+            data.phrases = None
+
         sentiment_tasks: dict[str, TaskID] = {}
 
         def sentiment_progress(stage: str, completed: int, total: int) -> None:
@@ -368,6 +478,8 @@ def analyze_command(args, input_path=None, preloaded_data=None):
                 RawStatisticsAnalyzer(
                     sentiment_progress=sentiment_progress,
                     ghost_timeline_days=args.ghost_timeline,
+                    phrase_workers=None,
+                    token_vocabulary=vocabulary,
                 )
             )
             _print_sentiment_info(analyzers[-1].sentiment_model_info)
@@ -464,7 +576,7 @@ def compare_command(args):
         transient=True,
     ) as progress:
         load_task = progress.add_task(f"Loading {year1} export data...", total=1)
-        data1 = export_data1 or ExportLoader.load(export_path1)
+        data1 = export_data1 or ExportLoader.load(export_path1, workers=None)
         progress.update(load_task, advance=1)
 
         analyzer = RawStatisticsAnalyzer(ghost_timeline_days=args.ghost_timeline)
@@ -491,7 +603,7 @@ def compare_command(args):
         transient=True,
     ) as progress:
         load_task = progress.add_task(f"Loading {year2} export data...", total=1)
-        data2 = export_data2 or ExportLoader.load(export_path2)
+        data2 = export_data2 or ExportLoader.load(export_path2, workers=None)
         progress.update(load_task, advance=1)
 
         analyzer = RawStatisticsAnalyzer(ghost_timeline_days=args.ghost_timeline)
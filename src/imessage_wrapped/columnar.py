@@ -0,0 +1,478 @@
+"""
+Compact binary columnar export format (``.iwc``).
+
+JSON exports spell out every field name for every message and make the loader
+parse each value from text. This format stores each message field as its own
+column instead, using only `struct` and `array` from the standard library:
+
+    b"IWCOL" + u8 format version
+    section*            u64 little-endian byte length + payload
+
+Sections, in order:
+
+    header              UTF-8 JSON: export fields, phrases, sentiment, tz table
+    strings             dictionary of every string value (id 0 means None)
+    conversations       varint stream: key, identifier, name, group flag,
+                        participants and message count per conversation
+    message columns     one section per field, all messages concatenated in
+                        conversation order
+
+    token columns       optional: per-message token counts and the varint token
+                        ids of every message flagged as carrying token ids
+
+Integer columns are either zigzag delta varints (ids and timestamps, which are
+mostly increasing) or fixed-width little-endian arrays using the narrowest
+typecode that fits (everything else). Boolean fields are bitpacked into one
+flag byte per message.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import IO, Any, Iterable, cast
+
+from .models import Conversation, ExportData, Message, Tapback
+
+__all__ = [
+    "COLUMNAR_SUFFIX",
+    "FORMAT_VERSION",
+    "read_columnar",
+    "read_columnar_header",
+    "write_columnar",
+]
+
+COLUMNAR_SUFFIX = ".iwc"
+MAGIC = b"IWCOL"
+FORMAT_VERSION = 1
+
+_SECTION = struct.Struct("<Q")
+_STRINGS_PREFIX = struct.Struct("<QQ")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_BIG_ENDIAN = sys.byteorder == "big"
+
+FLAG_FROM_ME = 1
+FLAG_ATTACHMENT = 2
+FLAG_QUESTION = 4
+FLAG_EXCLAMATION = 8
+FLAG_LINK = 16
+FLAG_TEXT = 32
+FLAG_READ_AFTER = 64
+FLAG_TOKENS = 128
+
+_REQUIRED_SECTIONS = 19
+_TOKEN_SECTIONS = 2
+
+
+def _encode_varints(values: Iterable[int]) -> bytes:
+    out = bytearray()
+    append = out.append
+    for value in values:
+        while value >= 0x80:
+            append((value & 0x7F) | 0x80)
+            value >>= 7
+        append(value)
+    return bytes(out)
+
+
+def _decode_varints(buffer: bytes | memoryview, count: int | None = None) -> list[int]:
+    values: list[int] = []
+    append = values.append
+    value = shift = 0
+    for byte in buffer:
+        if byte < 0x80:
+            append(value | (byte << shift))
+            value = shift = 0
+        else:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+    if shift or (count is not None and len(values) != count):
+        raise ValueError(f"Corrupt varint column: expected {count} values, got {len(values)}")
+    return values
+
+
+def _encode_deltas(values: Iterable[int]) -> bytes:
+    previous = 0
+    zigzag = []
+    for value in values:
+        delta = value - previous
+        zigzag.append(delta * 2 if delta >= 0 else -delta * 2 - 1)
+        previous = value
+    return _encode_varints(zigzag)
+
+
+def _decode_deltas(buffer: bytes | memoryview, count: int) -> list[int]:
+    values = _decode_varints(buffer, count)
+    current = 0
+    for idx, zigzag in enumerate(values):
+        current += (zigzag >> 1) ^ -(zigzag & 1)
+        values[idx] = current
+    return values
+
+
+def _encode_uints(values: list[int]) -> bytes:
+    largest = max(values, default=0)
+    for typecode in "BHIQ":
+        if largest < 1 << (8 * array(typecode).itemsize):
+            break
+    column = array(typecode, values)
+    if _BIG_ENDIAN:
+        column.byteswap()
+    return typecode.encode("ascii") + column.tobytes()
+
+
+def _decode_uints(buffer: bytes | memoryview, count: int) -> array:
+    column = array(chr(buffer[0]))
+    column.frombytes(buffer[1:])
+    if _BIG_ENDIAN:
+        column.byteswap()
+    if len(column) != count:
+        raise ValueError(f"Corrupt integer column: expected {count} values, got {len(column)}")
+    return column
+
+
+def _encode_floats(values: list[float]) -> bytes:
+    column = array("d", values)
+    if _BIG_ENDIAN:
+        column.byteswap()
+    return column.tobytes()
+
+
+def _decode_floats(buffer: bytes | memoryview) -> array:
+    column = array("d")
+    column.frombytes(buffer)
+    if _BIG_ENDIAN:
+        column.byteswap()
+    return column
+
+
+def _to_micros(timestamp: datetime) -> int:
+    epoch = _NAIVE_EPOCH if timestamp.tzinfo is None else _EPOCH
+    return (timestamp - epoch) // _MICROSECOND
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+
+    def __call__(self, value: str | None) -> int:
+        if value is None:
+            return 0
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.ids) + 1
+        return string_id
+
+    def encode(self) -> bytes:
+        # Lengths are in characters so the reader can decode the blob once and slice it.
+        strings = list(self.ids)
+        blob = "".join(strings).encode("utf-8")
+        lengths = _encode_uints([len(value) for value in strings])
+        return _STRINGS_PREFIX.pack(len(strings), len(lengths)) + lengths + blob
+
+
+def _decode_strings(buffer: bytes | memoryview) -> list[str | None]:
+    count, lengths_size = _STRINGS_PREFIX.unpack_from(buffer)
+    start = _STRINGS_PREFIX.size
+    lengths = _decode_uints(buffer[start : start + lengths_size], count)
+    text = bytes(buffer[start + lengths_size :]).decode("utf-8")
+    strings: list[str | None] = [None]
+    offset = 0
+    for length in lengths:
+        strings.append(text[offset : offset + length])
+        offset += length
+    return strings
+
+
+def write_columnar(data: ExportData, fileobj: IO[bytes], *, include_text: bool = False) -> None:
+    """Write ``data`` to a binary file object in the columnar layout."""
+
+    strings = _StringTable()
+    tz_offsets: dict[float | None, int] = {}
+
+    conversation_fields: list[int] = []
+    ids: list[int] = []
+    guids: list[int] = []
+    timestamps: list[int] = []
+    offsets: list[int] = []
+    flags = bytearray()
+    senders: list[int] = []
+    services: list[int] = []
+    text_lengths: list[int] = []
+    word_counts: list[int] = []
+    punctuation_counts: list[int] = []
+    read_after: list[float] = []
+    texts: list[int] = []
+    tapback_counts: list[int] = []
+    tapbacks: list[int] = []
+    emoji_sizes: list[int] = []
+    emojis: list[int] = []
+    token_counts: list[int] = []
+    token_ids: list[int] = []
+
+    for key, conv in data.conversations.items():
+        conversation_fields.extend(
+            (
+                strings(key),
+                strings(conv.chat_identifier),
+                strings(conv.display_name),
+                int(conv.is_group_chat),
+                len(conv.participants),
+            )
+        )
+        conversation_fields.extend(strings(participant) for participant in conv.participants)
+        conversation_fields.append(len(conv.messages))
+
+        for msg in conv.messages:
+            ids.append(msg.id)
+            guids.append(strings(msg.guid))
+            timestamps.append(_to_micros(msg.timestamp))
+            offset = msg.timestamp.utcoffset()
+            offset_key = None if offset is None else offset.total_seconds()
+            offset_id = tz_offsets.get(offset_key)
+            if offset_id is None:
+                offset_id = tz_offsets[offset_key] = len(tz_offsets)
+            offsets.append(offset_id)
+
+            text = msg.text if include_text else None
+            flags.append(
+                (FLAG_FROM_ME if msg.is_from_me else 0)
+                | (FLAG_ATTACHMENT if msg.has_attachment else 0)
+                | (FLAG_QUESTION if msg.has_question else 0)
+                | (FLAG_EXCLAMATION if msg.has_exclamation else 0)
+                | (FLAG_LINK if msg.has_link else 0)
+                | (FLAG_TEXT if text is not None else 0)
+                | (FLAG_READ_AFTER if msg.date_read_after_seconds is not None else 0)
+                | (FLAG_TOKENS if msg.token_ids is not None else 0)
+            )
+            senders.append(strings(msg.sender))
+            services.append(strings(msg.service))
+            text_lengths.append(msg.text_length)
+            word_counts.append(msg.word_count)
+            punctuation_counts.append(msg.punctuation_count)
+            if msg.date_read_after_seconds is not None:
+                read_after.append(msg.date_read_after_seconds)
+            if text is not None:
+                texts.append(strings(text))
+            tapback_counts.append(len(msg.tapbacks))
+            for tapback in msg.tapbacks:
+                tapbacks.append(strings(tapback.type))
+                tapbacks.append(strings(tapback.by))
+            emoji_sizes.append(len(msg.emoji_counts))
+            for emoji, count in msg.emoji_counts.items():
+                emojis.append(strings(emoji))
+                emojis.append(count)
+            if msg.token_ids is not None:
+                token_counts.append(len(msg.token_ids))
+                token_ids.extend(msg.token_ids)
+
+    header: dict[str, Any] = {
+        "export_date": data.export_date.isoformat(),
+        "year": data.year,
+        "total_messages": data.total_messages,
+        "conversation_count": len(data.conversations),
+        "message_count": len(ids),
+        "tz_offsets": list(tz_offsets),
+    }
+    if data.user_name is not None:
+        header["user_name"] = data.user_name
+    if data.phrases is not None:
+        header["phrases"] = data.phrases
+    if data.sentiment is not None:
+        header["sentiment"] = data.sentiment
+    if data.source is not None:
+        header["source"] = data.source
+
+    sections = [
+        json.dumps(header, ensure_ascii=False).encode("utf-8"),
+        strings.encode(),
+        _encode_varints(conversation_fields),
+        _encode_deltas(ids),
+        _encode_uints(guids),
+        _encode_deltas(timestamps),
+        _encode_uints(offsets),
+        bytes(flags),
+        _encode_uints(senders),
+        _encode_uints(services),
+        _encode_uints(text_lengths),
+        _encode_uints(word_counts),
+        _encode_uints(punctuation_counts),
+        _encode_floats(read_after),
+        _encode_uints(texts),
+        _encode_uints(tapback_counts),
+        _encode_uints(tapbacks),
+        _encode_uints(emoji_sizes),
+        _encode_varints(emojis),
+    ]
+    if token_counts:
+        sections.extend((_encode_uints(token_counts), _encode_varints(token_ids)))
+
+    fileobj.write(MAGIC + bytes((FORMAT_VERSION,)))
+    for section in sections:
+        fileobj.write(_SECTION.pack(len(section)))
+        fileobj.write(section)
+
+
+def _check_magic(buffer: bytes) -> None:
+    if buffer[: len(MAGIC)] != MAGIC or len(buffer) <= len(MAGIC):
+        raise ValueError("Not a columnar export (bad magic)")
+    version = buffer[len(MAGIC)]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar export version: {version}")
+
+
+def _split_sections(buffer: bytes) -> list[memoryview]:
+    _check_magic(buffer)
+
+    view = memoryview(buffer)
+    sections = []
+    position = len(MAGIC) + 1
+    while position < len(buffer):
+        (length,) = _SECTION.unpack_from(buffer, position)
+        position += _SECTION.size
+        if position + length > len(buffer):
+            raise ValueError("Corrupt columnar export: truncated section")
+        sections.append(view[position : position + length])
+        position += length
+    return sections
+
+
+def read_columnar_header(fileobj: IO[bytes]) -> dict[str, Any]:
+    """Read only the header section (export fields) of a columnar export."""
+
+    prefix = fileobj.read(len(MAGIC) + 1 + _SECTION.size)
+    _check_magic(prefix)
+    if len(prefix) < len(MAGIC) + 1 + _SECTION.size:
+        raise ValueError("Corrupt columnar export: truncated section")
+    (length,) = _SECTION.unpack_from(prefix, len(MAGIC) + 1)
+    payload = fileobj.read(length)
+    if len(payload) != length:
+        raise ValueError("Corrupt columnar export: truncated section")
+    return json.loads(payload.decode("utf-8"))
+
+
+def read_columnar(fileobj: IO[bytes]) -> ExportData:
+    """Rebuild `ExportData` from a columnar export."""
+
+    sections = _split_sections(fileobj.read())
+    if len(sections) not in (_REQUIRED_SECTIONS, _REQUIRED_SECTIONS + _TOKEN_SECTIONS):
+        raise ValueError(
+            f"Corrupt columnar export: expected {_REQUIRED_SECTIONS} or "
+            f"{_REQUIRED_SECTIONS + _TOKEN_SECTIONS} sections, got {len(sections)}"
+        )
+
+    header = json.loads(bytes(sections[0]).decode("utf-8"))
+    strings = _decode_strings(sections[1])
+    # Id 0 (None) is only ever written for optional fields (display names, text).
+    names = cast(list[str], strings)
+    n = header["message_count"]
+
+    ids = _decode_deltas(sections[3], n)
+    guids = _decode_uints(sections[4], n)
+    timestamps = _decode_deltas(sections[5], n)
+    offsets = _decode_uints(sections[6], n)
+    flags = bytes(sections[7])
+    senders = _decode_uints(sections[8], n)
+    services = _decode_uints(sections[9], n)
+    text_lengths = _decode_uints(sections[10], n)
+    word_counts = _decode_uints(sections[11], n)
+    punctuation_counts = _decode_uints(sections[12], n)
+    read_after = _decode_floats(sections[13])
+    text_ids = iter(_decode_uints(sections[14], sum(1 for flag in flags if flag & FLAG_TEXT)))
+    tapback_counts = _decode_uints(sections[15], n)
+    tapback_ids = _decode_uints(sections[16], 2 * sum(tapback_counts))
+    emoji_sizes = _decode_uints(sections[17], n)
+    emoji_pairs = _decode_varints(sections[18], 2 * sum(emoji_sizes))
+    if len(sections) > _REQUIRED_SECTIONS:
+        token_counts = _decode_uints(sections[19], sum(1 for flag in flags if flag & FLAG_TOKENS))
+        token_ids = _decode_varints(sections[20], sum(token_counts))
+    else:
+        token_counts = token_ids = []
+    token_sizes = iter(token_counts)
+
+    epochs = [
+        _NAIVE_EPOCH if seconds is None else _EPOCH.astimezone(timezone(timedelta(seconds=seconds)))
+        for seconds in header["tz_offsets"]
+    ]
+    read_after_values = iter(read_after)
+    tapback_pos = emoji_pos = token_pos = 0
+
+    def build_message(idx: int) -> Message:
+        nonlocal tapback_pos, emoji_pos, token_pos
+        flag = flags[idx]
+        tapback_count = tapback_counts[idx]
+        message_tapbacks = []
+        for _ in range(tapback_count):
+            message_tapbacks.append(
+                Tapback(
+                    type=names[tapback_ids[tapback_pos]], by=names[tapback_ids[tapback_pos + 1]]
+                )
+            )
+            tapback_pos += 2
+        emoji_counts = {}
+        for _ in range(emoji_sizes[idx]):
+            emoji_counts[names[emoji_pairs[emoji_pos]]] = emoji_pairs[emoji_pos + 1]
+            emoji_pos += 2
+        message_tokens = None
+        if flag & FLAG_TOKENS:
+            size = next(token_sizes)
+            message_tokens = token_ids[token_pos : token_pos + size]
+            token_pos += size
+        return Message(
+            id=ids[idx],
+            guid=names[guids[idx]],
+            timestamp=epochs[offsets[idx]] + timedelta(microseconds=timestamps[idx]),
+            is_from_me=bool(flag & FLAG_FROM_ME),
+            sender=names[senders[idx]],
+            text=strings[next(text_ids)] if flag & FLAG_TEXT else None,
+            service=names[services[idx]],
+            has_attachment=bool(flag & FLAG_ATTACHMENT),
+            date_read_after_seconds=next(read_after_values) if flag & FLAG_READ_AFTER else None,
+            tapbacks=message_tapbacks,
+            text_length=text_lengths[idx],
+            word_count=word_counts[idx],
+            punctuation_count=punctuation_counts[idx],
+            has_question=bool(flag & FLAG_QUESTION),
+            has_exclamation=bool(flag & FLAG_EXCLAMATION),
+            has_link=bool(flag & FLAG_LINK),
+            emoji_counts=emoji_counts,
+            token_ids=message_tokens,
+        )
+
+    fields = iter(_decode_varints(sections[2]))
+    conversations: dict[str, Conversation] = {}
+    next_message = 0
+    for _ in range(header["conversation_count"]):
+        key = names[next(fields)]
+        chat_identifier = names[next(fields)]
+        display_name = strings[next(fields)]
+        is_group_chat = bool(next(fields))
+        participants = [names[next(fields)] for _ in range(next(fields))]
+        message_count = next(fields)
+        conversations[key] = Conversation(
+            chat_id=0,
+            chat_identifier=chat_identifier,
+            display_name=display_name,
+            is_group_chat=is_group_chat,
+            participants=participants,
+            messages=[
+                build_message(idx) for idx in range(next_message, next_message + message_count)
+            ],
+        )
+        next_message += message_count
+
+    return ExportData(
+        export_date=datetime.fromisoformat(header["export_date"]),
+        year=header["year"],
+        conversations=conversations,
+        user_name=header.get("user_name"),
+        phrases=header.get("phrases"),
+        phrases_by_contact=None,
+        sentiment=header.get("sentiment"),
+        source=header.get("source"),
+    )
@@ -39,7 +39,25 @@ class DatabaseReader:
         logger.debug(f"Columns in {table_name}: {columns}")
         return columns
 
-    def fetch_messages(self, year: int, batch_size: int = 1000) -> Iterator[dict]:
+    def get_max_message_rowid(self) -> int:
+        assert self._conn is not None, "Database not connected"
+        row = self._conn.execute("SELECT max(ROWID) FROM message").fetchone()
+        return row[0] or 0
+
+    def fetch_messages(
+        self,
+        year: int,
+        batch_size: int = 1000,
+        after_rowid: int | None = None,
+        max_rowid: int | None = None,
+    ) -> Iterator[dict]:
+        """
+        Yield the year's message rows in date order.
+
+        ``after_rowid`` / ``max_rowid`` restrict rows to ``(after_rowid,
+        max_rowid]``, so an export can be pinned to a snapshot of the database
+        and later extended with only the rows added since.
+        """
         logger.debug(f"Fetching messages for year {year}")
 
         message_columns = self.get_table_columns("message")
@@ -74,13 +92,23 @@ class DatabaseReader:
         LEFT JOIN handle h ON m.handle_id = h.ROWID
         LEFT JOIN chat_message_join cmj ON m.ROWID = cmj.message_id
         LEFT JOIN chat c ON cmj.chat_id = c.ROWID
-        WHERE m.date >= ? AND m.date <= ?
+        WHERE m.date >= ? AND m.date <= ?{rowid_filter}
         ORDER BY m.date ASC
         """
 
-        logger.debug(f"Executing query with parameters: start_ns={start_ns}, end_ns={end_ns}")
+        params: list[int] = [start_ns, end_ns]
+        rowid_filter = ""
+        if after_rowid is not None:
+            rowid_filter += " AND m.ROWID > ?"
+            params.append(after_rowid)
+        if max_rowid is not None:
+            rowid_filter += " AND m.ROWID <= ?"
+            params.append(max_rowid)
+        query = query.format(rowid_filter=rowid_filter)
+
+        logger.debug(f"Executing query with parameters: {params}")
         assert self._conn is not None, "Database not connected"
-        cursor = self._conn.execute(query, (start_ns, end_ns))
+        cursor = self._conn.execute(query, params)
         logger.debug("Query executed successfully")
 
         while True:
@@ -541,6 +541,18 @@ class TerminalDisplay(Display):
         if ratio is not None:
             table.add_row("Ghost Ratio (You/Them)", f"{ratio:.2f}")
 
+        curve = {entry["timeline_days"]: entry for entry in ghosts.get("timeline_curve") or []}
+        checkpoints = [days for days in (1, 7, 30, 60) if days in curve]
+        if checkpoints:
+            table.add_row(
+                "Left Hanging by Threshold",
+                ", ".join(
+                    f"{days}d: {curve[days]['people_you_left_hanging']}"
+                    f"/{curve[days]['people_who_left_you_hanging']}"
+                    for days in checkpoints
+                ),
+            )
+
         self.console.print(table)
 
     def _render_cliffhangers_section(self, cliffhangers: dict[str, Any] | None) -> None:
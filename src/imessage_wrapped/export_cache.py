@@ -0,0 +1,210 @@
+"""
+Export cache validation tied to the chat.db state an export was built from.
+
+Every export records a `SourceFingerprint` in its header: the chat.db inode,
+size and mtime, the size of its write-ahead log, the highest message ROWID the
+export covers, the package version and whether contact names were resolved.
+`plan_export` compares it against the live database to decide what to do with
+an existing export:
+
+* ``reuse``: nothing relevant changed. When every file stat still matches the
+  database isn't even opened; otherwise one ``SELECT max(ROWID)`` confirms no
+  message was added (read receipts and WAL checkpoints touch the files without
+  adding rows).
+* ``extend``: same database, new ROWIDs. Only rows after the recorded ROWID are
+  read and merged in with `extend_export`.
+* ``rebuild``: no fingerprint, a different database file, another package
+  version or contacts setting, or rows were removed from the end.
+
+Extending appends new messages and tapbacks but keeps phrase and sentiment
+summaries from the last full build, and in-place edits of older rows are only
+picked up by a rebuild (``--replace-cache``).
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any
+
+from .db_reader import DatabaseReader
+from .loader import ExportLoader
+from .metadata import get_sdk_version
+from .models import Conversation, ExportData
+
+__all__ = [
+    "CachePlan",
+    "EXTEND",
+    "REBUILD",
+    "REUSE",
+    "SourceFingerprint",
+    "extend_export",
+    "fingerprint_database",
+    "plan_export",
+    "read_export_fingerprint",
+]
+
+REUSE = "reuse"
+EXTEND = "extend"
+REBUILD = "rebuild"
+
+
+@dataclass(frozen=True)
+class SourceFingerprint:
+    db_inode: int
+    db_size: int
+    db_mtime_ns: int
+    wal_size: int
+    max_rowid: int
+    sdk_version: str
+    with_contacts: bool
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> SourceFingerprint | None:
+        if not isinstance(data, dict):
+            return None
+        try:
+            return cls(**{f.name: data[f.name] for f in fields(cls)})
+        except KeyError:
+            return None
+
+
+@dataclass(frozen=True)
+class CachePlan:
+    action: str
+    fingerprint: SourceFingerprint
+    reason: str
+    cached: SourceFingerprint | None = None
+
+
+def _stat_database(db_path: str) -> tuple[int, int, int, int]:
+    stat = os.stat(db_path)
+    try:
+        wal_size = os.stat(f"{db_path}-wal").st_size
+    except FileNotFoundError:
+        wal_size = 0
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns, wal_size
+
+
+def _query_max_rowid(db_path: str) -> int:
+    with DatabaseReader(db_path) as reader:
+        return reader.get_max_message_rowid()
+
+
+def fingerprint_database(
+    db_path: str | None = None,
+    *,
+    with_contacts: bool = False,
+    max_rowid: int | None = None,
+) -> SourceFingerprint:
+    """
+    Fingerprint chat.db. Files are stat'ed before ROWID is read, so a write that
+    lands in between makes the next check look changed rather than current.
+    """
+
+    db_path = DatabaseReader(db_path).db_path
+    inode, size, mtime_ns, wal_size = _stat_database(db_path)
+    return SourceFingerprint(
+        db_inode=inode,
+        db_size=size,
+        db_mtime_ns=mtime_ns,
+        wal_size=wal_size,
+        max_rowid=_query_max_rowid(db_path) if max_rowid is None else max_rowid,
+        sdk_version=get_sdk_version(),
+        with_contacts=with_contacts,
+    )
+
+
+def read_export_fingerprint(export_path: str | Path) -> SourceFingerprint | None:
+    try:
+        header = ExportLoader.read_header(export_path)
+    except (OSError, ValueError):
+        return None
+    return SourceFingerprint.from_dict(header.get("source"))
+
+
+def plan_export(
+    export_path: str | Path, db_path: str | None = None, *, with_contacts: bool = False
+) -> CachePlan:
+    """Decide whether ``export_path`` can be reused, extended or must be rebuilt."""
+
+    db_path = DatabaseReader(db_path).db_path
+    export_path = Path(export_path)
+    cached = read_export_fingerprint(export_path) if export_path.exists() else None
+
+    if (
+        cached is not None
+        and cached.with_contacts == with_contacts
+        and cached.sdk_version == get_sdk_version()
+        and (cached.db_inode, cached.db_size, cached.db_mtime_ns, cached.wal_size)
+        == _stat_database(db_path)
+    ):
+        return CachePlan(REUSE, cached, "chat.db unchanged", cached)
+
+    current = fingerprint_database(db_path, with_contacts=with_contacts)
+    if not export_path.exists():
+        return CachePlan(REBUILD, current, "no export yet")
+    if cached is None:
+        return CachePlan(REBUILD, current, "export has no source fingerprint")
+    if cached.sdk_version != current.sdk_version:
+        return CachePlan(REBUILD, current, f"built by version {cached.sdk_version}", cached)
+    if cached.with_contacts != with_contacts:
+        return CachePlan(REBUILD, current, "contacts setting changed", cached)
+    if cached.db_inode != current.db_inode:
+        return CachePlan(REBUILD, current, "chat.db was replaced", cached)
+    if current.max_rowid < cached.max_rowid:
+        return CachePlan(REBUILD, current, "messages were removed", cached)
+    if current.max_rowid == cached.max_rowid:
+        return CachePlan(REUSE, current, "no new messages", cached)
+    return CachePlan(
+        EXTEND, current, f"{current.max_rowid - cached.max_rowid} new database rows", cached
+    )
+
+
+def extend_export(cached: ExportData, delta: ExportData) -> ExportData:
+    """
+    Merge an export of only newer rows into a previously built export.
+
+    The delta holds new messages plus copies of older messages that received
+    new tapbacks; those copies only carry the new tapbacks.
+    """
+
+    by_guid = {
+        message.guid: message
+        for conversation in cached.conversations.values()
+        for message in conversation.messages
+    }
+    touched = set()
+    for key, conversation in delta.conversations.items():
+        for message in conversation.messages:
+            existing = by_guid.get(message.guid)
+            if existing is not None:
+                existing.tapbacks.extend(message.tapbacks)
+                continue
+            target = cached.conversations.get(key)
+            if target is None:
+                target = cached.conversations[key] = Conversation(
+                    chat_id=conversation.chat_id,
+                    chat_identifier=conversation.chat_identifier,
+                    display_name=conversation.display_name,
+                    is_group_chat=conversation.is_group_chat,
+                    participants=conversation.participants,
+                )
+            target.messages.append(message)
+            by_guid[message.guid] = message
+            touched.add(key)
+
+    # Match a full build: the year's messages by date, then out-of-year tapback parents.
+    year = cached.year
+    for key in touched:
+        cached.conversations[key].messages.sort(
+            key=lambda message: (message.timestamp.year != year, message.timestamp)
+        )
+
+    cached.export_date = delta.export_date
+    cached.user_name = cached.user_name or delta.user_name
+    return cached
@@ -0,0 +1,193 @@
+"""
+Sidecar byte-offset index for JSONL exports (``export.jsonl.idx``).
+
+When `Exporter` writes an uncompressed JSONL export it also records, for every
+conversation, where its conversation record lives and which byte spans hold its
+messages for each month. `ExportLoader` memory-maps the export and reads only
+the spans a filtered load needs, so pulling one conversation (or one month) out
+of a large export costs O(records needed) instead of O(file).
+
+The index stores the export's size and mtime and is ignored as soon as the
+export no longer matches them.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from .streams import create_temp_file
+
+__all__ = ["ExportIndex", "INDEX_SUFFIX", "index_path_for", "month_key", "read_spans"]
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+
+
+def index_path_for(export_path: str | Path) -> Path:
+    export_path = Path(export_path)
+    return export_path.with_name(export_path.name + INDEX_SUFFIX)
+
+
+def month_key(timestamp: datetime) -> str:
+    """``YYYY-MM`` of a timestamp, in UTC when the timestamp is aware."""
+
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return f"{timestamp.year:04d}-{timestamp.month:02d}"
+
+
+@dataclass
+class ExportIndex:
+    """
+    Byte spans of an export's records.
+
+    Attributes:
+        header: ``[offset, length]`` of the v2 header record. For v1 exports
+            this is the first message line, which carries the export fields.
+        conversations: ``{key: {"record": [offset, length] | None, "months":
+            {"YYYY-MM": [[offset, length, line_count], ...]}}}``. Consecutive
+            message lines of the same month share one span.
+    """
+
+    schema_version: int
+    header: list[int] | None = None
+    conversations: dict[str, dict[str, Any]] = field(default_factory=dict)
+    _position: int = field(default=0, repr=False)
+    _last_spans: list | None = field(default=None, repr=False)
+    _last_end: int = field(default=-1, repr=False)
+
+    def _advance(self, text: str) -> tuple[int, int]:
+        # Records are written with a leading "\n" separator except the first one.
+        end = self._position + len(text.encode("utf-8"))
+        start = self._position + (1 if text.startswith("\n") else 0)
+        self._position = end
+        return start, end
+
+    def _entry(self, key: str) -> dict[str, Any]:
+        entry = self.conversations.get(key)
+        if entry is None:
+            entry = self.conversations[key] = {"record": None, "months": {}}
+        return entry
+
+    def add_header(self, text: str) -> None:
+        start, end = self._advance(text)
+        self.header = [start, end - start]
+
+    def add_conversation(self, key: str, text: str) -> None:
+        start, end = self._advance(text)
+        self._entry(key)["record"] = [start, end - start]
+        self._last_spans = None
+
+    def add_message(self, key: str, month: str, text: str) -> None:
+        start, end = self._advance(text)
+        if self.header is None and self.schema_version == 1:
+            self.header = [start, end - start]
+        spans = self._entry(key)["months"].setdefault(month, [])
+        if spans and spans is self._last_spans and self._last_end + 1 == start:
+            span = spans[-1]
+            span[1] = end - span[0]
+            span[2] += 1
+        else:
+            spans.append([start, end - start, 1])
+        self._last_spans = spans
+        self._last_end = end
+
+    def save(self, export_path: str | Path) -> None:
+        """Atomically write the sidecar next to a finished export."""
+
+        export_path = Path(export_path)
+        stat = export_path.stat()
+        payload = {
+            "version": INDEX_VERSION,
+            "schema_version": self.schema_version,
+            "export_size": stat.st_size,
+            "export_mtime_ns": stat.st_mtime_ns,
+            "header": self.header,
+            "conversations": self.conversations,
+        }
+        index_path = index_path_for(export_path)
+        fd, temp_name = create_temp_file(index_path)
+        try:
+            with open(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temp_name, index_path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, export_path: str | Path) -> ExportIndex | None:
+        """Read the sidecar of ``export_path``; None if missing, corrupt or stale."""
+
+        export_path = Path(export_path)
+        try:
+            with open(index_path_for(export_path), encoding="utf-8") as handle:
+                payload = json.load(handle)
+            stat = export_path.stat()
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(payload, dict)
+            or payload.get("version") != INDEX_VERSION
+            or payload.get("export_size") != stat.st_size
+            or payload.get("export_mtime_ns") != stat.st_mtime_ns
+        ):
+            return None
+        return cls(
+            schema_version=payload["schema_version"],
+            header=payload["header"],
+            conversations=payload["conversations"],
+        )
+
+    def spans(
+        self,
+        matches_conversation: Callable[[str], bool],
+        months: tuple[str, str] | None = None,
+    ) -> Iterator[tuple[int, int]]:
+        """
+        Yield ``(offset, length)`` spans, in file order per conversation, of the
+        header plus every selected conversation's record and message months.
+
+        ``months`` is an inclusive ``(first, last)`` range of ``YYYY-MM`` keys.
+        """
+
+        header = self.header
+        if header is not None:
+            yield header[0], header[1]
+        for key, entry in self.conversations.items():
+            if not matches_conversation(key):
+                continue
+            selected = [
+                (span[0], span[1])
+                for month, month_spans in entry["months"].items()
+                if months is None or months[0] <= month <= months[1]
+                for span in month_spans
+            ]
+            if not selected:
+                continue
+            if entry["record"] is not None:
+                yield entry["record"][0], entry["record"][1]
+            for offset, length in sorted(selected):
+                if header is not None and offset == header[0]:
+                    # v1: the header line is also a message line; don't read it twice.
+                    if length <= header[1]:
+                        continue
+                    offset, length = offset + header[1] + 1, length - header[1] - 1
+                yield offset, length
+
+
+def read_spans(export_path: str | Path, spans: Iterator[tuple[int, int]]) -> Iterator[str]:
+    """Yield the lines inside ``spans`` of an export via a read-only memory map."""
+
+    with open(export_path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset, length in spans:
+                yield from mapped[offset : offset + length].decode("utf-8").split("\n")
@@ -1,13 +1,47 @@
+import io
 import json
+import os
 from pathlib import Path
-from typing import Protocol
+from typing import IO, Any, Literal, Protocol, runtime_checkable
 
+from .columnar import write_columnar
+from .export_index import ExportIndex, index_path_for, month_key
 from .models import Conversation, ExportData, Message, Tapback
+from .streams import compression_for, create_temp_file, open_export
+
+JSONL_SCHEMA_VERSION = 2
 
 
 class Serializer(Protocol):
     def serialize(self, data: ExportData) -> str: ...
 
+    def write(self, data: ExportData, fileobj: IO[str]) -> None:
+        """Stream the serialized export into ``fileobj`` piece by piece."""
+        ...
+
+
+@runtime_checkable
+class IndexedSerializer(Serializer, Protocol):
+    """A text serializer that can record an `ExportIndex` while writing."""
+
+    supports_index: bool
+    schema_version: int
+
+    def write(
+        self, data: ExportData, fileobj: IO[str], *, index: ExportIndex | None = None
+    ) -> None: ...
+
+
+@runtime_checkable
+class BinarySerializer(Protocol):
+    """A serializer producing bytes; `Exporter` writes it to a binary stream."""
+
+    binary: Literal[True]
+
+    def serialize(self, data: ExportData) -> bytes: ...
+
+    def write(self, data: ExportData, fileobj: IO[bytes]) -> None: ...
+
 
 class JSONSerializer:
     def __init__(self, indent: int | None = 2, include_text: bool = False):
@@ -15,21 +49,67 @@ class JSONSerializer:
         self.include_text = include_text
 
     def serialize(self, data: ExportData) -> str:
-        payload = {
-            "export_date": data.export_date.isoformat(),
-            "year": data.year,
-            "total_messages": data.total_messages,
-            "conversations": {
-                key: self._serialize_conversation(conv) for key, conv in data.conversations.items()
-            },
-        }
+        buffer = io.StringIO()
+        self.write(data, buffer)
+        return buffer.getvalue()
+
+    def write(self, data: ExportData, fileobj: IO[str]) -> None:
+        # Produces the same text as json.dumps(payload, indent=...) but only ever
+        # holds one serialized conversation in memory.
+        if self.indent is None:
+            newline, item_separator = "", ", "
+        else:
+            newline, item_separator = "\n", ","
+
+        fields: list[tuple[str, Any]] = [
+            ("export_date", data.export_date.isoformat()),
+            ("year", data.year),
+            ("total_messages", data.total_messages),
+        ]
+        if data.source is not None:
+            # Ahead of the conversations so cache checks can stop reading early.
+            fields.append(("source", data.source))
+        fields.append(("conversations", None))
         if data.user_name is not None:
-            payload["user_name"] = data.user_name
+            fields.append(("user_name", data.user_name))
         if data.phrases is not None:
-            payload["phrases"] = data.phrases
+            fields.append(("phrases", data.phrases))
         if data.sentiment is not None:
-            payload["sentiment"] = data.sentiment
-        return json.dumps(payload, indent=self.indent, ensure_ascii=False)
+            fields.append(("sentiment", data.sentiment))
+
+        fileobj.write("{")
+        for position, (key, value) in enumerate(fields):
+            if position:
+                fileobj.write(item_separator)
+            fileobj.write(newline + self._pad(1) + json.dumps(key) + ": ")
+            if key == "conversations":
+                self._write_conversations(data, fileobj, newline, item_separator)
+            else:
+                fileobj.write(self._dumps(value, level=1))
+        fileobj.write(newline + "}")
+
+    def _write_conversations(
+        self, data: ExportData, fileobj: IO[str], newline: str, item_separator: str
+    ) -> None:
+        if not data.conversations:
+            fileobj.write("{}")
+            return
+        fileobj.write("{")
+        for position, (key, conv) in enumerate(data.conversations.items()):
+            if position:
+                fileobj.write(item_separator)
+            fileobj.write(newline + self._pad(2) + json.dumps(key, ensure_ascii=False) + ": ")
+            fileobj.write(self._dumps(self._serialize_conversation(conv), level=2))
+        fileobj.write(newline + self._pad(1) + "}")
+
+    def _pad(self, level: int) -> str:
+        return " " * (self.indent or 0) * level
+
+    def _dumps(self, value: Any, *, level: int) -> str:
+        encoded = json.dumps(value, indent=self.indent, ensure_ascii=False)
+        if self.indent is None:
+            return encoded
+        return encoded.replace("\n", "\n" + self._pad(level))
 
     def _serialize_conversation(self, conv: Conversation) -> dict:
         return {
@@ -62,6 +142,9 @@ class JSONSerializer:
         if self.include_text:
             data["text"] = msg.text
 
+        if msg.token_ids is not None:
+            data["token_ids"] = msg.token_ids
+
         if msg.date_read_after_seconds is not None:
             data["date_read_after_seconds"] = msg.date_read_after_seconds
 
@@ -75,11 +158,89 @@ class JSONSerializer:
 
 
 class JSONLSerializer:
-    def __init__(self, include_text: bool = False):
+    """
+    Line-delimited export.
+
+    Schema v2 writes one header record with the export-level fields, then for
+    each conversation a conversation record followed by its message records,
+    which reference the conversation by index instead of repeating its metadata.
+    Schema v1 (one self-contained record per message) is still available via
+    ``schema_version=1``.
+
+    Passing an `ExportIndex` to `write` records the byte span of every line.
+    """
+
+    supports_index = True
+
+    def __init__(self, include_text: bool = False, schema_version: int = JSONL_SCHEMA_VERSION):
+        if schema_version not in (1, 2):
+            raise ValueError(f"Unsupported JSONL schema version: {schema_version}")
         self.include_text = include_text
+        self.schema_version = schema_version
 
     def serialize(self, data: ExportData) -> str:
-        lines = []
+        buffer = io.StringIO()
+        self.write(data, buffer)
+        return buffer.getvalue()
+
+    def write(
+        self, data: ExportData, fileobj: IO[str], *, index: ExportIndex | None = None
+    ) -> None:
+        if self.schema_version == 1:
+            self._write_v1(data, fileobj, index)
+        else:
+            self._write_v2(data, fileobj, index)
+
+    def _write_v2(self, data: ExportData, fileobj: IO[str], index: ExportIndex | None) -> None:
+        header = {
+            "type": "header",
+            "schema_version": 2,
+            "export_date": data.export_date.isoformat(),
+            "year": data.year,
+            "total_messages": data.total_messages,
+            "conversation_count": len(data.conversations),
+        }
+        if data.user_name is not None:
+            header["user_name"] = data.user_name
+        if data.phrases is not None:
+            header["phrases"] = data.phrases
+        if data.sentiment is not None:
+            header["sentiment"] = data.sentiment
+        if data.source is not None:
+            header["source"] = data.source
+        text = json.dumps(header, ensure_ascii=False)
+        fileobj.write(text)
+        if index is not None:
+            index.add_header(text)
+
+        for position, (conv_key, conv) in enumerate(data.conversations.items()):
+            record = {
+                "type": "conversation",
+                "index": position,
+                "key": conv_key,
+                "chat_identifier": conv.chat_identifier,
+                "display_name": conv.display_name,
+                "is_group_chat": conv.is_group_chat,
+                "participants": conv.participants,
+                "message_count": len(conv.messages),
+            }
+            text = "\n" + json.dumps(record, ensure_ascii=False)
+            fileobj.write(text)
+            if index is not None:
+                index.add_conversation(conv_key, text)
+            for msg in conv.messages:
+                message = {"type": "message", "conversation": position}
+                message.update(self._serialize_message(msg))
+                # Optional in v2, like tapbacks; most messages have no emoji.
+                if not msg.emoji_counts:
+                    del message["emoji_counts"]
+                text = "\n" + json.dumps(message, ensure_ascii=False)
+                fileobj.write(text)
+                if index is not None:
+                    index.add_message(conv_key, month_key(msg.timestamp), text)
+
+    def _write_v1(self, data: ExportData, fileobj: IO[str], index: ExportIndex | None) -> None:
+        first = True
         for conv_key, conv in data.conversations.items():
             for msg in conv.messages:
                 line_data = {
@@ -98,8 +259,15 @@ class JSONLSerializer:
                     line_data["phrases"] = data.phrases
                 if data.sentiment is not None:
                     line_data["sentiment"] = data.sentiment
-                lines.append(json.dumps(line_data, ensure_ascii=False))
-        return "\n".join(lines)
+                if data.source is not None:
+                    line_data["source"] = data.source
+                text = json.dumps(line_data, ensure_ascii=False)
+                if not first:
+                    text = "\n" + text
+                fileobj.write(text)
+                if index is not None:
+                    index.add_message(conv_key, month_key(msg.timestamp), text)
+                first = False
 
     def _serialize_message(self, msg: Message) -> dict:
         data = {
@@ -123,6 +291,9 @@ class JSONLSerializer:
         if self.include_text:
             data["text"] = msg.text
 
+        if msg.token_ids is not None:
+            data["token_ids"] = msg.token_ids
+
         if msg.date_read_after_seconds is not None:
             data["date_read_after_seconds"] = msg.date_read_after_seconds
 
@@ -135,15 +306,62 @@ class JSONLSerializer:
         return {"type": tapback.type, "by": tapback.by}
 
 
+class ColumnarSerializer:
+    """Binary columnar export (see `imessage_wrapped.columnar`)."""
+
+    binary: Literal[True] = True
+
+    def __init__(self, include_text: bool = False):
+        self.include_text = include_text
+
+    def serialize(self, data: ExportData) -> bytes:
+        buffer = io.BytesIO()
+        self.write(data, buffer)
+        return buffer.getvalue()
+
+    def write(self, data: ExportData, fileobj: IO[bytes]) -> None:
+        write_columnar(data, fileobj, include_text=self.include_text)
+
+
 class Exporter:
-    def __init__(self, serializer: Serializer | None = None):
-        self.serializer = serializer or JSONLSerializer()
+    def __init__(self, serializer: Serializer | BinarySerializer | None = None):
+        self.serializer: Serializer | BinarySerializer = serializer or JSONLSerializer()
 
-    def export_to_string(self, data: ExportData) -> str:
+    def export_to_string(self, data: ExportData) -> str | bytes:
         return self.serializer.serialize(data)
 
     def export_to_file(self, data: ExportData, output_path: str | Path) -> None:
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        content = self.export_to_string(data)
-        output_path.write_text(content, encoding="utf-8")
+
+        # Write next to the target and rename so readers never see a partial export.
+        # A .gz/.zst suffix on the target compresses the stream on the way out.
+        serializer = self.serializer
+        mode = "wb" if isinstance(serializer, BinarySerializer) else "wt"
+        compression = compression_for(output_path)
+        # Byte offsets only mean something in an uncompressed file.
+        indexed: IndexedSerializer | None = None
+        index = None
+        if (
+            compression is None
+            and isinstance(serializer, IndexedSerializer)
+            and serializer.supports_index
+        ):
+            indexed = serializer
+            index = ExportIndex(schema_version=serializer.schema_version)
+        fd, temp_name = create_temp_file(output_path)
+        try:
+            with open_export(fd, mode, compression=compression) as handle:
+                if indexed is not None:
+                    indexed.write(data, handle, index=index)
+                else:
+                    serializer.write(data, handle)
+            os.replace(temp_name, output_path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+        if index is not None:
+            index.save(output_path)
+        else:
+            index_path_for(output_path).unlink(missing_ok=True)
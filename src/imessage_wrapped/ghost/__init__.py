@@ -9,19 +9,25 @@ without needing to know the implementation details.
 
 from .filters import (
     ConversationFilter,
+    ConversationStats,
+    StatsFilter,
     apply_conversation_filters,
     minimum_responses_filter,
     minimum_total_messages_filter,
     received_to_sent_ratio_filter,
 )
-from .metrics import GhostStats, compute_ghost_stats
+from .metrics import GhostCurve, GhostStats, compute_ghost_curve, compute_ghost_stats
 
 __all__ = [
     "ConversationFilter",
+    "ConversationStats",
+    "StatsFilter",
     "apply_conversation_filters",
     "minimum_responses_filter",
     "minimum_total_messages_filter",
     "received_to_sent_ratio_filter",
+    "GhostCurve",
     "GhostStats",
+    "compute_ghost_curve",
     "compute_ghost_stats",
 ]
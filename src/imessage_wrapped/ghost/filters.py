@@ -1,11 +1,44 @@
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Iterable, Mapping, Protocol, Sequence
+from datetime import datetime
+from typing import Iterable, Mapping, Protocol, Sequence, runtime_checkable
 
 from ..models import Conversation, Message
 
 
+@dataclass(frozen=True)
+class ConversationStats:
+    """In-year message counts and time span of a conversation."""
+
+    sent: int = 0
+    received: int = 0
+    first_timestamp: datetime | None = None
+    last_timestamp: datetime | None = None
+
+    @property
+    def total(self) -> int:
+        return self.sent + self.received
+
+    @classmethod
+    def from_conversation(cls, conversation: Conversation, year: int) -> "ConversationStats":
+        sent = 0
+        received = 0
+        first: datetime | None = None
+        last: datetime | None = None
+        for msg in _messages_in_year(conversation, year):
+            if msg.is_from_me:
+                sent += 1
+            else:
+                received += 1
+            if first is None or msg.timestamp < first:
+                first = msg.timestamp
+            if last is None or msg.timestamp > last:
+                last = msg.timestamp
+        return cls(sent=sent, received=received, first_timestamp=first, last_timestamp=last)
+
+
 class ConversationFilter(Protocol):
     """Callable object that decides if a conversation should be used."""
 
@@ -16,6 +49,18 @@ class ConversationFilter(Protocol):
     def __call__(self, conversation: Conversation, *, year: int) -> bool: ...
 
 
+@runtime_checkable
+class StatsFilter(ConversationFilter, Protocol):
+    """
+    Filter that can also decide from a precomputed `ConversationStats`.
+
+    `apply_conversation_filters` calls ``evaluate`` instead of the filter itself,
+    so a chain of such filters reads each conversation's messages only once.
+    """
+
+    def evaluate(self, stats: ConversationStats) -> bool: ...
+
+
 def apply_conversation_filters(
     conversations: Mapping[str, Conversation],
     *,
@@ -25,6 +70,10 @@ def apply_conversation_filters(
     """
     Return a shallow copy of the conversations mapping with only the items that pass
     every provided filter. Filters can be omitted to keep all conversations.
+
+    Each conversation's `ConversationStats` is computed once per call and shared by
+    the whole chain. It isn't kept between calls because conversations are mutable
+    (`extend_export` appends to them in place).
     """
 
     if not filters:
@@ -32,11 +81,23 @@ def apply_conversation_filters(
 
     filtered: dict[str, Conversation] = {}
     for key, conversation in conversations.items():
-        if all(filter_fn(conversation, year=year) for filter_fn in filters):
+        summary = ConversationStats.from_conversation(conversation, year)
+        if all(_passes(filter_fn, conversation, summary, year) for filter_fn in filters):
             filtered[key] = conversation
     return filtered
 
 
+def _passes(
+    filter_fn: ConversationFilter,
+    conversation: Conversation,
+    stats: ConversationStats,
+    year: int,
+) -> bool:
+    if isinstance(filter_fn, StatsFilter):
+        return filter_fn.evaluate(stats)
+    return filter_fn(conversation, year=year)
+
+
 def _messages_in_year(conversation: Conversation, year: int) -> Iterable[Message]:
     for message in conversation.messages:
         if getattr(message, "is_context_only", False):
@@ -47,21 +108,14 @@ def _messages_in_year(conversation: Conversation, year: int) -> Iterable[Message
 
 
 @dataclass
-class _BaseFilter:
+class _BaseFilter(ABC):
     min_messages_required: int = 1
 
-    def _count_messages(self, conversation: Conversation, year: int) -> tuple[int, int]:
-        sent = 0
-        received = 0
-        for msg in _messages_in_year(conversation, year):
-            if msg.is_from_me:
-                sent += 1
-            else:
-                received += 1
-        return sent, received
+    def __call__(self, conversation: Conversation, *, year: int) -> bool:
+        return self.evaluate(ConversationStats.from_conversation(conversation, year))
 
-    def _total_messages(self, conversation: Conversation, year: int) -> int:
-        return sum(1 for _ in _messages_in_year(conversation, year))
+    @abstractmethod
+    def evaluate(self, stats: ConversationStats) -> bool: ...
 
 
 @dataclass
@@ -72,16 +126,14 @@ class _ReceivedToSentRatioFilter(_BaseFilter):
     def name(self) -> str:
         return "received_to_sent_ratio"
 
-    def __call__(self, conversation: Conversation, *, year: int) -> bool:
-        sent, received = self._count_messages(conversation, year)
-
-        if sent < self.min_messages_required:
+    def evaluate(self, stats: ConversationStats) -> bool:
+        if stats.sent < self.min_messages_required:
             return False
 
-        if received == 0:
+        if stats.received == 0:
             return True
 
-        ratio = received / max(sent, 1)
+        ratio = stats.received / max(stats.sent, 1)
         return ratio <= self.max_ratio
 
 
@@ -93,9 +145,8 @@ class _MinimumResponsesFilter(_BaseFilter):
     def name(self) -> str:
         return "minimum_user_responses"
 
-    def __call__(self, conversation: Conversation, *, year: int) -> bool:
-        sent, _ = self._count_messages(conversation, year)
-        return sent >= self.min_user_responses
+    def evaluate(self, stats: ConversationStats) -> bool:
+        return stats.sent >= self.min_user_responses
 
 
 @dataclass
@@ -106,8 +157,8 @@ class _MinimumTotalMessagesFilter(_BaseFilter):
     def name(self) -> str:
         return "minimum_total_messages"
 
-    def __call__(self, conversation: Conversation, *, year: int) -> bool:
-        return self._total_messages(conversation, year) >= self.min_total_messages
+    def evaluate(self, stats: ConversationStats) -> bool:
+        return stats.total >= self.min_total_messages
 
 
 def received_to_sent_ratio_filter(
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_left
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Iterable
 
 from ..models import Conversation, Message
+from ..sessions import ConversationSessions
 
 
 @dataclass
@@ -17,6 +20,58 @@ class GhostStats:
     ghosted_you_count: int = 0
 
 
+_MICROSECOND = timedelta(microseconds=1)
+
+
+@dataclass
+class GhostCurve:
+    """
+    Ghost counts for every silence threshold at once.
+
+    A conversation counts as ghosted at timeline ``T`` exactly when its longest
+    qualifying silence (after a run of at least ``min_consecutive_messages``) is
+    ``>= T``. Storing those maxima as sorted arrays turns each threshold query
+    into a binary search.
+    """
+
+    reference_time: datetime
+    min_consecutive_messages: int
+    min_conversation_messages: int
+    # Longest silence (microseconds) after their runs / your runs, sorted ascending.
+    you_ghosted_silences: array
+    ghosted_you_silences: array
+
+    def counts(self, timeline: timedelta) -> tuple[int, int]:
+        """Return ``(you_ghosted_count, ghosted_you_count)`` for one threshold."""
+
+        if timeline <= timedelta(0):
+            raise ValueError("timeline must be a positive duration")
+        threshold = timeline // _MICROSECOND
+        you_ghosted = len(self.you_ghosted_silences) - bisect_left(
+            self.you_ghosted_silences, threshold
+        )
+        ghosted_you = len(self.ghosted_you_silences) - bisect_left(
+            self.ghosted_you_silences, threshold
+        )
+        return you_ghosted, ghosted_you
+
+    def stats(self, timeline: timedelta) -> GhostStats:
+        you_ghosted, ghosted_you = self.counts(timeline)
+        return GhostStats(
+            timeline=timeline,
+            reference_time=self.reference_time,
+            min_consecutive_messages=self.min_consecutive_messages,
+            min_conversation_messages=self.min_conversation_messages,
+            you_ghosted_count=you_ghosted,
+            ghosted_you_count=ghosted_you,
+        )
+
+    def sweep(self, max_days: int = 60) -> list[tuple[int, int, int]]:
+        """Return ``(days, you_ghosted, ghosted_you)`` for every timeline 1..max_days."""
+
+        return [(days, *self.counts(timedelta(days=days))) for days in range(1, max_days + 1)]
+
+
 def compute_ghost_stats(
     conversations: Iterable[Conversation],
     *,
@@ -26,6 +81,7 @@ def compute_ghost_stats(
     min_conversation_messages: int,
     reference_time: datetime | None = None,
     include_group_chats: bool = False,
+    sessions: Iterable[ConversationSessions] | None = None,
 ) -> GhostStats:
     """
     Classify which contacts were ghosted in each direction.
@@ -38,43 +94,77 @@ def compute_ghost_stats(
         min_conversation_messages: Minimum sent+received messages for analysis.
         reference_time: Used when no further responses exist.
         include_group_chats: Whether to include group conversations.
+        sessions: Prebuilt session indexes for the same conversations. When
+            omitted they are derived from ``conversations``.
     """
 
     if timeline <= timedelta(0):
         raise ValueError("timeline must be a positive duration")
 
+    curve = compute_ghost_curve(
+        conversations,
+        year=year,
+        min_consecutive_messages=min_consecutive_messages,
+        min_conversation_messages=min_conversation_messages,
+        reference_time=reference_time,
+        include_group_chats=include_group_chats,
+        sessions=sessions,
+    )
+    return curve.stats(timeline)
+
+
+def compute_ghost_curve(
+    conversations: Iterable[Conversation],
+    *,
+    year: int,
+    min_consecutive_messages: int,
+    min_conversation_messages: int,
+    reference_time: datetime | None = None,
+    include_group_chats: bool = False,
+    sessions: Iterable[ConversationSessions] | None = None,
+) -> GhostCurve:
+    """
+    Precompute ghost classification for every silence threshold.
+
+    Takes the same arguments as `compute_ghost_stats` minus ``timeline``; query
+    the returned curve with `GhostCurve.counts` or `GhostCurve.sweep`.
+    """
+
     if min_consecutive_messages <= 0:
         raise ValueError("min_consecutive_messages must be positive")
 
     reference_time = _normalize_reference_time(reference_time)
-    stats = GhostStats(
-        timeline=timeline,
-        reference_time=reference_time,
-        min_consecutive_messages=min_consecutive_messages,
-        min_conversation_messages=min_conversation_messages,
-    )
 
-    for conversation in conversations:
-        if conversation.is_group_chat and not include_group_chats:
+    if sessions is None:
+        sessions = (ConversationSessions.build(conv, year) for conv in conversations)
+
+    you_ghosted: list[int] = []
+    ghosted_you: list[int] = []
+    for conversation_sessions in sessions:
+        if conversation_sessions.conversation.is_group_chat and not include_group_chats:
             continue
 
-        messages = _conversation_messages(conversation, year)
-        if len(messages) < min_conversation_messages:
+        if len(conversation_sessions) < min_conversation_messages:
             continue
 
-        you_ghosted, they_ghosted = _classify_conversation(
-            messages,
-            timeline,
+        longest_them, longest_me = _longest_silences(
+            conversation_sessions,
             reference_time,
             min_consecutive_messages=min_consecutive_messages,
         )
 
-        if you_ghosted:
-            stats.you_ghosted_count += 1
-        if they_ghosted:
-            stats.ghosted_you_count += 1
+        if longest_them is not None:
+            you_ghosted.append(longest_them)
+        if longest_me is not None:
+            ghosted_you.append(longest_me)
 
-    return stats
+    return GhostCurve(
+        reference_time=reference_time,
+        min_consecutive_messages=min_consecutive_messages,
+        min_conversation_messages=min_conversation_messages,
+        you_ghosted_silences=array("q", sorted(you_ghosted)),
+        ghosted_you_silences=array("q", sorted(ghosted_you)),
+    )
 
 
 def _normalize_reference_time(ts: datetime | None) -> datetime:
@@ -85,94 +175,40 @@ def _normalize_reference_time(ts: datetime | None) -> datetime:
     return ts
 
 
-def _conversation_messages(conversation: Conversation, year: int) -> list[Message]:
-    messages = [
-        msg
-        for msg in conversation.messages
-        if not getattr(msg, "is_context_only", False) and msg.timestamp.year == year
-    ]
-    messages.sort(key=lambda m: m.timestamp)
-    return messages
-
-
-def _classify_conversation(
-    messages: list[Message],
-    timeline: timedelta,
+def _longest_silences(
+    sessions: ConversationSessions,
     reference_time: datetime,
     *,
     min_consecutive_messages: int,
-) -> tuple[bool, bool]:
+) -> tuple[int | None, int | None]:
     """
-    Determine whether each direction satisfies the ghost criteria.
+    Longest silence in microseconds after a qualifying run, per direction.
+
+    Returns ``(after_their_runs, after_your_runs)``; ``None`` means no run in
+    that direction was long enough to count.
     """
 
-    runs = _generate_runs(messages)
-    you_ghosted = False
-    ghosted_you = False
+    messages = sessions.messages
+    longest_them: int | None = None
+    longest_me: int | None = None
 
-    for run in runs:
-        if run.length < min_consecutive_messages:
+    for start, length in sessions.runs():
+        if length < min_consecutive_messages:
             continue
 
-        response_time = _next_response_time(messages, run.end_index, reference_time)
+        end_index = start + length - 1
+        response_time = _next_response_time(messages, end_index, reference_time)
         if response_time is None:
             continue
 
-        silence = response_time - run.end_timestamp
-        if silence < timeline:
-            continue
-
-        if run.actor == "me":
-            ghosted_you = True
-        else:
-            you_ghosted = True
-
-        if you_ghosted and ghosted_you:
-            break
-
-    return you_ghosted, ghosted_you
-
-
-@dataclass
-class _Run:
-    actor: str  # "me" or "them"
-    length: int
-    end_index: int
-    end_timestamp: datetime
-
-
-def _generate_runs(messages: list[Message]) -> list[_Run]:
-    runs: list[_Run] = []
-    current_actor: str | None = None
-    run_length = 0
-    for idx, message in enumerate(messages):
-        actor = "me" if message.is_from_me else "them"
-        if actor != current_actor:
-            if current_actor is not None:
-                runs.append(
-                    _Run(
-                        actor=current_actor,
-                        length=run_length,
-                        end_index=idx - 1,
-                        end_timestamp=messages[idx - 1].timestamp,
-                    )
-                )
-            current_actor = actor
-            run_length = 1
-        else:
-            run_length += 1
-
-    if current_actor is not None and run_length > 0:
-        runs.append(
-            _Run(
-                actor=current_actor,
-                length=run_length,
-                end_index=len(messages) - 1,
-                end_timestamp=messages[-1].timestamp,
-            )
-        )
+        silence = (response_time - messages[end_index].timestamp) // _MICROSECOND
+        if messages[end_index].is_from_me:
+            if longest_me is None or silence > longest_me:
+                longest_me = silence
+        elif longest_them is None or silence > longest_them:
+            longest_them = silence
 
-    return runs
+    return longest_them, longest_me
 
 
 def _next_response_time(
@@ -0,0 +1,170 @@
+"""
+Incremental JSON reading over a buffered window.
+
+`json.load` builds the whole document before returning, so loading a ``.json``
+export holds every raw message dict alongside the `Message` objects built from
+them. `JSONStreamReader` walks the container structure itself and hands each
+value to `json.JSONDecoder.raw_decode` as soon as it is fully buffered, so the
+caller can convert and drop one message at a time. Only the current window
+(plus the value being decoded) is ever held as text.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import IO, Any, Iterator
+
+__all__ = ["JSONStreamReader"]
+
+READ_SIZE = 256 * 1024
+_WHITESPACE = " \t\n\r"
+_NUMBER_START = "-0123456789"
+
+
+class JSONStreamReader:
+    """
+    Pull-style reader for one JSON document from a text stream.
+
+    Containers are iterated with `iter_object` / `iter_array`; anything else is
+    decoded whole with `value`. Iterating a container requires consuming (or
+    `skip`-ping) each yielded member before advancing.
+    """
+
+    def __init__(self, stream: IO[str], read_size: int = READ_SIZE):
+        self._stream = stream
+        self._read_size = read_size
+        self._decode = json.JSONDecoder().raw_decode
+        self._buffer = ""
+        self._pos = 0
+        self._offset = 0  # Characters dropped from the front of the buffer.
+        self._eof = False
+
+    def _fill(self, minimum: int) -> bool:
+        """Append at least ``minimum`` characters unless the stream ends first."""
+
+        if self._eof:
+            return False
+        if self._pos:
+            self._offset += self._pos
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        chunks = [self._buffer]
+        read = 0
+        while read < minimum:
+            chunk = self._stream.read(max(self._read_size, minimum - read))
+            if not chunk:
+                self._eof = True
+                break
+            chunks.append(chunk)
+            read += len(chunk)
+        self._buffer = "".join(chunks)
+        return read > 0
+
+    def _error(self, message: str, pos: int | None = None) -> ValueError:
+        pos = self._pos if pos is None else pos
+        return ValueError(f"Invalid JSON: {message} (char {self._offset + pos})")
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ("" at end of input)."""
+
+        while True:
+            buffer, pos = self._buffer, self._pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill(self._read_size):
+                return ""
+
+    def _expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+
+        if not self.peek():
+            raise self._error("Expecting value")
+        while True:
+            try:
+                result, end = self._decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # Possibly an incomplete value at the end of the window: grow it
+                # and retry. Growing geometrically keeps a huge value from being
+                # re-decoded O(n^2) times.
+                error = self._error(e.msg, e.pos)
+                if not self._fill(max(self._read_size, len(self._buffer))):
+                    raise error from None
+                continue
+            # A number or literal touching the end of the window may continue. So
+            # may a number cut right after its "." or exponent ("3." of "3.25",
+            # "1e" or "1e+" of "1e+5"), which decodes as its shorter prefix.
+            tail = len(self._buffer) - end
+            if (
+                tail == 0
+                or (
+                    tail <= 2
+                    and self._buffer[end] in ".eE"
+                    and self._buffer[self._pos] in _NUMBER_START
+                )
+            ) and self._fill(self._read_size):
+                continue
+            self._pos = end
+            return result
+
+    def skip(self) -> None:
+        """Consume the next value without keeping it."""
+
+        char = self.peek()
+        if char == "{":
+            for _ in self.iter_object():
+                self.skip()
+        elif char == "[":
+            for _ in self.iter_array():
+                self.skip()
+        else:
+            self.value()
+
+    def _iter_members(self, open_char: str, close_char: str) -> Iterator[None]:
+        self._expect(open_char)
+        if self.peek() == close_char:
+            self._pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self._pos += 1
+            if char == close_char:
+                return
+            if char != ",":
+                self._pos -= 1
+                raise self._error(f"Expecting ',' or '{close_char}'")
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield each key of the next object; the caller consumes its value."""
+
+        for _ in self._iter_members("{", "}"):
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.value()
+            self._expect(":")
+            yield key
+
+    def iter_array(self) -> Iterator[None]:
+        """Yield once per element of the next array; the caller consumes it."""
+
+        yield from self._iter_members("[", "]")
+
+    def iter_values(self) -> Iterator[Any]:
+        """Yield each decoded element of the next array."""
+
+        for _ in self.iter_array():
+            yield self.value()
+
+    def end(self) -> None:
+        """Raise unless only whitespace remains."""
+
+        if self.peek():
+            raise self._error("Extra data")
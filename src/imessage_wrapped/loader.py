@@ -1,189 +1,690 @@
 import json
-from collections import defaultdict
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Iterable, Iterator
 
+from .columnar import COLUMNAR_SUFFIX, read_columnar, read_columnar_header
+from .export_index import ExportIndex, month_key, read_spans
+from .json_stream import JSONStreamReader
 from .models import Conversation, ExportData, Message, Tapback
+from .streams import compression_for, export_suffix, open_export
+
+SUPPORTED_JSONL_SCHEMA_VERSIONS = (1, 2)
+# Below this size process start-up costs more than parsing in parallel saves.
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+CHUNKS_PER_WORKER = 4
+
+_decode_json = json.JSONDecoder().decode
+
+
+def _parse_message(msg_data: dict[str, Any]) -> Message:
+    # Most messages have no tapbacks or emoji; skip building anything for them.
+    tapbacks = msg_data.get("tapbacks")
+    emoji_counts = msg_data.get("emoji_counts")
+    return Message(
+        id=msg_data["id"],
+        guid=msg_data["guid"],
+        timestamp=datetime.fromisoformat(msg_data["timestamp"]),
+        is_from_me=msg_data["is_from_me"],
+        sender=msg_data["sender"],
+        text=msg_data.get("text"),
+        service=msg_data["service"],
+        has_attachment=msg_data["has_attachment"],
+        date_read_after_seconds=msg_data.get("date_read_after_seconds"),
+        tapbacks=[Tapback(type=tb["type"], by=tb["by"]) for tb in tapbacks] if tapbacks else [],
+        text_length=msg_data.get("text_length", 0),
+        word_count=msg_data.get("word_count", 0),
+        punctuation_count=msg_data.get("punctuation_count", 0),
+        has_question=msg_data.get("has_question", False),
+        has_exclamation=msg_data.get("has_exclamation", False),
+        has_link=msg_data.get("has_link", False),
+        emoji_counts=emoji_counts if emoji_counts else {},
+        token_ids=msg_data.get("token_ids"),
+    )
+
+
+def _message_row(msg_data: dict[str, Any]) -> tuple:
+    """Parse a message into a plain tuple, which pickles far cheaper than a `Message`."""
+
+    tapbacks = msg_data.get("tapbacks")
+    return (
+        msg_data["id"],
+        msg_data["guid"],
+        datetime.fromisoformat(msg_data["timestamp"]),
+        msg_data["is_from_me"],
+        msg_data["sender"],
+        msg_data.get("text"),
+        msg_data["service"],
+        msg_data["has_attachment"],
+        msg_data.get("date_read_after_seconds"),
+        [(tb["type"], tb["by"]) for tb in tapbacks] if tapbacks else None,
+        msg_data.get("text_length", 0),
+        msg_data.get("word_count", 0),
+        msg_data.get("punctuation_count", 0),
+        msg_data.get("has_question", False),
+        msg_data.get("has_exclamation", False),
+        msg_data.get("has_link", False),
+        msg_data.get("emoji_counts") or None,
+        msg_data.get("token_ids"),
+    )
+
+
+def _message_from_row(row: tuple) -> Message:
+    (
+        msg_id,
+        guid,
+        timestamp,
+        is_from_me,
+        sender,
+        text,
+        service,
+        has_attachment,
+        date_read_after_seconds,
+        tapbacks,
+        text_length,
+        word_count,
+        punctuation_count,
+        has_question,
+        has_exclamation,
+        has_link,
+        emoji_counts,
+        token_ids,
+    ) = row
+    return Message(
+        id=msg_id,
+        guid=guid,
+        timestamp=timestamp,
+        is_from_me=is_from_me,
+        sender=sender,
+        text=text,
+        service=service,
+        has_attachment=has_attachment,
+        date_read_after_seconds=date_read_after_seconds,
+        tapbacks=[Tapback(type=kind, by=by) for kind, by in tapbacks] if tapbacks else [],
+        text_length=text_length,
+        word_count=word_count,
+        punctuation_count=punctuation_count,
+        has_question=has_question,
+        has_exclamation=has_exclamation,
+        has_link=has_link,
+        emoji_counts=emoji_counts or {},
+        token_ids=token_ids,
+    )
+
+
+# Raw-line probes used to skip records before decoding them. A JSON string value
+# can never contain an unescaped quote, so a `"key": value` match is always a
+# real key of the record. Probes only ever reject; anything they cannot decide
+# is decoded and checked exactly.
+_V2_MESSAGE_PREFIX = re.compile(r'^\{"type": "message", "conversation": (\d+),')
+_V1_CONVERSATION_KEY = re.compile(r'"conversation_key": ("(?:[^"\\]|\\.)*")')
+_TIMESTAMP_YEAR = re.compile(r'"timestamp": "(\d{4})-')
+_TIMESTAMP_UNIX = re.compile(r'"timestamp_unix": (-?\d+)')
+_FROM_ME_TRUE = '"is_from_me": true'
+_FROM_ME_FALSE = '"is_from_me": false'
+
+
+@dataclass(frozen=True)
+class MessageFilter:
+    """
+    Message predicates for `ExportLoader.iter_messages` and filtered loads.
+
+    Every predicate that is set must hold. ``start`` is inclusive and ``end``
+    exclusive; both must match the timestamps' awareness (exports are UTC).
+    """
+
+    year: int | None = None
+    is_from_me: bool | None = None
+    conversation_keys: frozenset[str] | None = None
+    start: datetime | None = None
+    end: datetime | None = None
+
+    def __post_init__(self) -> None:
+        if self.conversation_keys is not None and not isinstance(self.conversation_keys, frozenset):
+            object.__setattr__(self, "conversation_keys", frozenset(self.conversation_keys))
+
+    @property
+    def _has_time_predicate(self) -> bool:
+        return self.year is not None or self.start is not None or self.end is not None
+
+    def matches_conversation(self, key: str) -> bool:
+        return self.conversation_keys is None or key in self.conversation_keys
+
+    def matches(self, message: Message) -> bool:
+        if self.is_from_me is not None and message.is_from_me != self.is_from_me:
+            return False
+        return self._matches_time(message.timestamp)
+
+    def _matches_time(self, timestamp: datetime) -> bool:
+        if self.year is not None and timestamp.year != self.year:
+            return False
+        if self.start is not None and timestamp < self.start:
+            return False
+        if self.end is not None and timestamp >= self.end:
+            return False
+        return True
+
+    def matches_record(self, msg_data: dict[str, Any]) -> bool:
+        """Exact check against a decoded message record, before building a `Message`."""
+
+        if self.is_from_me is not None and msg_data["is_from_me"] != self.is_from_me:
+            return False
+        if self._has_time_predicate:
+            return self._matches_time(datetime.fromisoformat(msg_data["timestamp"]))
+        return True
+
+    def rejects_line(self, line: str, index_keys: dict[int, str]) -> bool:
+        """Cheap check on an undecoded JSONL line; True only if it can never match."""
+
+        if self.is_from_me is not None:
+            if (_FROM_ME_FALSE if self.is_from_me else _FROM_ME_TRUE) in line:
+                return True
+        if self.conversation_keys is not None:
+            match = _V2_MESSAGE_PREFIX.match(line)
+            if match is not None:
+                key = index_keys.get(int(match.group(1)))
+                if key is not None and key not in self.conversation_keys:
+                    return True
+            else:
+                match = _V1_CONVERSATION_KEY.search(line)
+                if match is not None and json.loads(match.group(1)) not in self.conversation_keys:
+                    return True
+        if self.year is not None:
+            match = _TIMESTAMP_YEAR.search(line)
+            if match is not None and int(match.group(1)) != self.year:
+                return True
+        if self.start is not None or self.end is not None:
+            match = _TIMESTAMP_UNIX.search(line)
+            if match is not None:
+                # timestamp_unix is the timestamp truncated to whole seconds.
+                unix = int(match.group(1))
+                if self.start is not None and unix + 1 <= self.start.timestamp():
+                    return True
+                if self.end is not None and unix >= self.end.timestamp():
+                    return True
+        return False
+
+
+def _iter_records(
+    lines: Iterable[str],
+    where: MessageFilter | None = None,
+    index_keys: dict[int, str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Decode JSONL records, skipping lines ``where`` rejects without decoding them.
+
+    ``index_keys`` collects the v2 conversation index -> key mapping as
+    conversation records go by, so message lines can be rejected by conversation.
+    The first record is always decoded: it is the v2 header, or a v1 line that
+    carries the export fields.
+    """
+
+    if index_keys is None:
+        index_keys = {}
+    first = True
+    for line_num, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if where is not None and not first and where.rejects_line(line, index_keys):
+            continue
+        first = False
+        try:
+            record = _decode_json(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_num}: {e}")
+        if record.get("type") == "conversation":
+            index_keys[record["index"]] = record["key"]
+        yield record
+
+
+_V1_EXPORT_FIELDS = ("export_date", "year", "user_name", "phrases", "sentiment", "source")
+
+
+@dataclass
+class _JsonlChunk:
+    """
+    Partial result of parsing a run of JSONL records.
+
+    Conversations are keyed by their v2 index or, for v1 records, their
+    conversation key. Chunks merge in file order, so per-conversation message
+    order is preserved whether the file was read serially or in byte ranges.
+    Chunks parsed in worker processes hold `_message_row` tuples (``rows``)
+    instead of `Message` objects.
+    """
+
+    header: dict[str, Any] | None = None
+    export_fields: dict[str, Any] = field(default_factory=dict)
+    conversations: dict[Any, dict[str, Any]] = field(default_factory=dict)
+    messages: dict[Any, list] = field(default_factory=dict)
+    rows: bool = False
+
+
+def _collect_records(
+    records: Iterable[dict[str, Any]],
+    *,
+    rows: bool = False,
+    where: MessageFilter | None = None,
+) -> _JsonlChunk:
+    chunk = _JsonlChunk(rows=rows)
+    parse = _message_row if rows else _parse_message
+    messages = chunk.messages
+    for record in records:
+        record_type = record.get("type")
+        if record_type == "message":
+            ref = record["conversation"]
+            msg_data = record
+        elif record_type == "conversation":
+            chunk.conversations[record["index"]] = record
+            continue
+        elif record_type == "header":
+            if chunk.header is None:
+                chunk.header = record
+            continue
+        else:
+            # v1: every line repeats the export and conversation metadata.
+            ref = record["conversation_key"]
+            for name in _V1_EXPORT_FIELDS:
+                if chunk.export_fields.get(name) is None and record.get(name) is not None:
+                    chunk.export_fields[name] = record[name]
+            chunk.conversations[ref] = {
+                "chat_identifier": record["chat_identifier"],
+                "display_name": record.get("display_name"),
+                "is_group_chat": record.get("is_group_chat", False),
+                "participants": record.get("participants", []),
+            }
+            msg_data = record["message"]
+            if where is not None and not where.matches_conversation(ref):
+                continue
+
+        if where is not None and not where.matches_record(msg_data):
+            continue
+        bucket = messages.get(ref)
+        if bucket is None:
+            bucket = messages[ref] = []
+        bucket.append(parse(msg_data))
+    return chunk
+
+
+def _merge_chunks(chunks: Iterable[_JsonlChunk], where: MessageFilter | None = None) -> ExportData:
+    header: dict[str, Any] | None = None
+    export_fields: dict[str, Any] = {}
+    conversation_meta: dict[Any, dict[str, Any]] = {}
+    messages: dict[Any, list[Message]] = {}
+    for chunk in chunks:
+        if header is None:
+            header = chunk.header
+        for name, value in chunk.export_fields.items():
+            export_fields.setdefault(name, value)
+        conversation_meta.update(chunk.conversations)
+        for ref, chunk_messages in chunk.messages.items():
+            if chunk.rows:
+                chunk_messages = [_message_from_row(row) for row in chunk_messages]
+            existing = messages.get(ref)
+            if existing is None:
+                messages[ref] = chunk_messages
+            else:
+                existing.extend(chunk_messages)
+
+    if header is not None:
+        version = header.get("schema_version")
+        if version not in SUPPORTED_JSONL_SCHEMA_VERSIONS:
+            raise ValueError(f"Unsupported export schema version: {version}")
+        for ref in messages:
+            if ref not in conversation_meta:
+                raise ValueError(f"Message references unknown conversation {ref}")
+        export_fields = header
+        keyed = ((meta["key"], ref, meta) for ref, meta in conversation_meta.items())
+    else:
+        if export_fields.get("export_date") is None or export_fields.get("year") is None:
+            raise ValueError("Export file is empty or missing required fields")
+        keyed = ((ref, ref, meta) for ref, meta in conversation_meta.items())
+
+    conversations = {}
+    for key, ref, meta in keyed:
+        if where is not None and (not where.matches_conversation(key) or ref not in messages):
+            continue
+        conversations[key] = Conversation(
+            chat_id=0,
+            chat_identifier=meta["chat_identifier"],
+            display_name=meta.get("display_name"),
+            is_group_chat=meta.get("is_group_chat", False),
+            participants=meta.get("participants", []),
+            messages=messages.get(ref, []),
+        )
+
+    # Per-contact phrases are intentionally not exported.
+    return ExportData(
+        export_date=datetime.fromisoformat(export_fields["export_date"]),
+        year=export_fields["year"],
+        conversations=conversations,
+        user_name=export_fields.get("user_name"),
+        phrases=export_fields.get("phrases"),
+        phrases_by_contact=None,
+        sentiment=export_fields.get("sentiment"),
+        source=export_fields.get("source"),
+    )
+
+
+def _filter_export(data: ExportData, where: MessageFilter) -> ExportData:
+    """Apply ``where`` to an already-loaded export (formats without line probes)."""
+
+    conversations = {}
+    for key, conversation in data.conversations.items():
+        if not where.matches_conversation(key):
+            continue
+        messages = [message for message in conversation.messages if where.matches(message)]
+        if messages:
+            conversation.messages = messages
+            conversations[key] = conversation
+    data.conversations = conversations
+    return data
+
+
+def _indexed_lines(file_path: Path, where: MessageFilter | None) -> Iterator[str] | None:
+    """
+    Lines of the records ``where`` can match, read through the export's `.idx`
+    sidecar. None when there is no usable index or nothing to narrow down by.
+    """
+
+    if where is None or (where.conversation_keys is None and not where._has_time_predicate):
+        return None
+    index = ExportIndex.load(file_path)
+    if index is None:
+        return None
+
+    first, last = "0000-00", "9999-99"
+    if where.year is not None:
+        # Month keys are UTC; allow a month of slack for timestamps in other offsets.
+        first, last = f"{where.year - 1:04d}-12", f"{where.year + 1:04d}-01"
+    if where.start is not None:
+        first = max(first, month_key(where.start))
+    if where.end is not None:
+        last = min(last, month_key(where.end))
+    months = None if (first, last) == ("0000-00", "9999-99") else (first, last)
+    return read_spans(file_path, index.spans(where.matches_conversation, months))
+
+
+def _iter_jsonl_messages(
+    lines: Iterable[str], where: MessageFilter | None
+) -> Iterator[tuple[str, Message]]:
+    index_keys: dict[int, str] = {}
+    for record in _iter_records(lines, where, index_keys):
+        record_type = record.get("type")
+        if record_type == "message":
+            key = index_keys.get(record["conversation"])
+            if key is None:
+                raise ValueError(
+                    f"Message references unknown conversation {record['conversation']}"
+                )
+            msg_data = record
+        elif record_type is None:
+            key = record["conversation_key"]
+            msg_data = record["message"]
+        else:
+            continue
+        if where is not None and not (
+            where.matches_conversation(key) and where.matches_record(msg_data)
+        ):
+            continue
+        yield key, _parse_message(msg_data)
+
+
+def _read_json_conversation(reader: JSONStreamReader, where: MessageFilter | None) -> Conversation:
+    conv_data: dict[str, Any] = {}
+    messages: list[Message] = []
+    for field_name in reader.iter_object():
+        if field_name != "messages":
+            conv_data[field_name] = reader.value()
+            continue
+        for msg_data in reader.iter_values():
+            message = _parse_message(msg_data)
+            if where is None or where.matches(message):
+                messages.append(message)
+
+    return Conversation(
+        chat_id=0,
+        chat_identifier=conv_data["chat_identifier"],
+        display_name=conv_data.get("display_name"),
+        is_group_chat=conv_data["is_group_chat"],
+        participants=conv_data["participants"],
+        messages=messages,
+    )
+
+
+def _split_byte_ranges(file_path: Path, parts: int) -> list[tuple[int, int]]:
+    """Split a file into up to ``parts`` ranges that start at line boundaries."""
+
+    size = file_path.stat().st_size
+    bounds = [0]
+    with open(file_path, "rb") as f:
+        for part in range(1, parts):
+            target = size * part // parts
+            if target <= bounds[-1]:
+                continue
+            # Finish the line containing byte target-1 so the range starts on a new line.
+            f.seek(target - 1)
+            f.readline()
+            position = f.tell()
+            if position >= size:
+                break
+            bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _parse_byte_range(
+    file_path: str, start: int, end: int, where: MessageFilter | None = None
+) -> _JsonlChunk:
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        lines = f.read(end - start).decode("utf-8").split("\n")
+    try:
+        return _collect_records(_iter_records(lines, where), rows=True, where=where)
+    except ValueError as e:
+        raise ValueError(f"{e} (in byte range {start}-{end} of {file_path})") from e
 
 
 class ExportLoader:
     @staticmethod
-    def load_from_jsonl(file_path: str | Path) -> ExportData:
+    def load_from_jsonl(
+        file_path: str | Path,
+        *,
+        workers: int | None = 1,
+        where: MessageFilter | None = None,
+    ) -> ExportData:
+        """
+        Load a v1 or v2 JSONL export.
+
+        Args:
+            file_path: Export path (``.jsonl``, ``.jsonl.gz`` or ``.jsonl.zst``).
+            workers: Worker processes for uncompressed files of at least
+                ``PARALLEL_MIN_BYTES``; None uses every core. Compressed files
+                cannot be split and are always read serially.
+            where: Only keep matching messages, and conversations that still
+                have messages. Rejected lines are skipped before JSON decoding.
+        """
+
         file_path = Path(file_path)
 
         if not file_path.exists():
             raise FileNotFoundError(f"Export file not found: {file_path}")
 
-        conversations_dict = defaultdict(
-            lambda: {
-                "messages": [],
-                "chat_identifier": None,
-                "display_name": None,
-                "is_group_chat": False,
-                "participants": [],
-            }
-        )
+        workers = workers or os.cpu_count() or 1
+        compression = compression_for(file_path)
+        if compression is None:
+            lines = _indexed_lines(file_path, where)
+            if lines is not None:
+                return _merge_chunks(
+                    [_collect_records(_iter_records(lines, where), where=where)], where
+                )
+        if workers > 1 and compression is None and file_path.stat().st_size >= PARALLEL_MIN_BYTES:
+            return ExportLoader._load_jsonl_parallel(file_path, workers, where)
 
-        export_date = None
-        year = None
-        user_name = None
-        phrases = None
-        phrases_by_contact = None
-        sentiment = None
-
-        with open(file_path, "r", encoding="utf-8") as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
+        with open_export(file_path, "rt", compression=compression) as f:
+            return _merge_chunks([_collect_records(_iter_records(f, where), where=where)], where)
 
-                try:
-                    data = json.loads(line)
-                except json.JSONDecodeError as e:
-                    raise ValueError(f"Invalid JSON on line {line_num}: {e}")
-
-                if export_date is None:
-                    export_date = datetime.fromisoformat(data["export_date"])
-                if year is None:
-                    year = data["year"]
-                if user_name is None:
-                    user_name = data.get("user_name")
-                if phrases is None:
-                    phrases = data.get("phrases")
-                # Per-contact phrases are intentionally not exported.
-                if sentiment is None:
-                    sentiment = data.get("sentiment")
-
-                conv_key = data["conversation_key"]
-                conv_data = conversations_dict[conv_key]
-
-                conv_data["chat_identifier"] = data["chat_identifier"]
-                conv_data["display_name"] = data.get("display_name")
-                conv_data["is_group_chat"] = data.get("is_group_chat", False)
-                conv_data["participants"] = data.get("participants", [])
-
-                msg_data = data["message"]
-                message = Message(
-                    id=msg_data["id"],
-                    guid=msg_data["guid"],
-                    timestamp=datetime.fromisoformat(msg_data["timestamp"]),
-                    is_from_me=msg_data["is_from_me"],
-                    sender=msg_data["sender"],
-                    text=msg_data.get("text"),
-                    service=msg_data["service"],
-                    has_attachment=msg_data["has_attachment"],
-                    date_read_after_seconds=msg_data.get("date_read_after_seconds"),
-                    tapbacks=[
-                        Tapback(type=tb["type"], by=tb["by"]) for tb in msg_data.get("tapbacks", [])
-                    ],
-                    text_length=msg_data.get("text_length", 0),
-                    word_count=msg_data.get("word_count", 0),
-                    punctuation_count=msg_data.get("punctuation_count", 0),
-                    has_question=msg_data.get("has_question", False),
-                    has_exclamation=msg_data.get("has_exclamation", False),
-                    has_link=msg_data.get("has_link", False),
-                    emoji_counts=msg_data.get("emoji_counts", {}) or {},
-                )
+    @staticmethod
+    def _load_jsonl_parallel(
+        file_path: Path, workers: int, where: MessageFilter | None = None
+    ) -> ExportData:
+        # A few ranges per worker keeps cores busy when record sizes are uneven.
+        ranges = _split_byte_ranges(file_path, workers * CHUNKS_PER_WORKER)
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+            chunks = executor.map(
+                _parse_byte_range,
+                [str(file_path)] * len(ranges),
+                [start for start, _ in ranges],
+                [end for _, end in ranges],
+                [where] * len(ranges),
+            )
+            return _merge_chunks(chunks, where)
 
-                conv_data["messages"].append(message)
+    @staticmethod
+    def load_from_json(file_path: str | Path, *, where: MessageFilter | None = None) -> ExportData:
+        """
+        Load a ``.json`` export incrementally.
 
-        if export_date is None or year is None:
-            raise ValueError("Export file is empty or missing required fields")
+        Messages are decoded and converted one at a time, so the raw parse tree
+        of the document never exists in full next to the loaded models.
+        """
 
+        file_path = Path(file_path)
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"Export file not found: {file_path}")
+
+        fields: dict[str, Any] = {}
         conversations = {}
-        for conv_key, conv_data in conversations_dict.items():
-            conversation = Conversation(
-                chat_id=0,
-                chat_identifier=conv_data["chat_identifier"],
-                display_name=conv_data["display_name"],
-                is_group_chat=conv_data["is_group_chat"],
-                participants=conv_data["participants"],
-                messages=conv_data["messages"],
-            )
-            conversations[conv_key] = conversation
+        with open_export(file_path, "rt", compression=compression_for(file_path)) as f:
+            reader = JSONStreamReader(f)
+            for key in reader.iter_object():
+                if key != "conversations":
+                    fields[key] = reader.value()
+                    continue
+                for conv_key in reader.iter_object():
+                    if where is not None and not where.matches_conversation(conv_key):
+                        reader.skip()
+                        continue
+                    conversation = _read_json_conversation(reader, where)
+                    if where is None or conversation.messages:
+                        conversations[conv_key] = conversation
+            reader.end()
 
         return ExportData(
-            export_date=export_date,
-            year=year,
+            export_date=datetime.fromisoformat(fields["export_date"]),
+            year=fields["year"],
             conversations=conversations,
-            user_name=user_name,
-            phrases=phrases,
-            phrases_by_contact=phrases_by_contact,
-            sentiment=sentiment,
+            user_name=fields.get("user_name"),
+            phrases=fields.get("phrases"),
+            phrases_by_contact=fields.get("phrases_by_contact"),
+            sentiment=fields.get("sentiment"),
+            source=fields.get("source"),
         )
 
     @staticmethod
-    def load_from_json(file_path: str | Path) -> ExportData:
+    def load_from_columnar(file_path: str | Path) -> ExportData:
         file_path = Path(file_path)
 
         if not file_path.exists():
             raise FileNotFoundError(f"Export file not found: {file_path}")
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open_export(file_path, "rb", compression=compression_for(file_path)) as f:
+            return read_columnar(f)
 
-        export_date = datetime.fromisoformat(data["export_date"])
-        year = data["year"]
-        user_name = data.get("user_name")
+    @staticmethod
+    def read_header(file_path: str | Path) -> dict[str, Any]:
+        """
+        Read an export's top-level fields (export date, year, source
+        fingerprint, ...) without loading its messages. For ``.json`` exports
+        only the fields written ahead of ``conversations`` are returned.
+        """
 
-        phrases = data.get("phrases")
-        phrases_by_contact = data.get("phrases_by_contact")
-        sentiment = data.get("sentiment")
+        file_path = Path(file_path)
+        suffix = export_suffix(file_path)
+        compression = compression_for(file_path)
 
-        conversations = {}
-        for conv_key, conv_data in data["conversations"].items():
-            messages = []
-            for msg_data in conv_data["messages"]:
-                message = Message(
-                    id=msg_data["id"],
-                    guid=msg_data["guid"],
-                    timestamp=datetime.fromisoformat(msg_data["timestamp"]),
-                    is_from_me=msg_data["is_from_me"],
-                    sender=msg_data["sender"],
-                    text=msg_data.get("text"),
-                    service=msg_data["service"],
-                    has_attachment=msg_data["has_attachment"],
-                    date_read_after_seconds=msg_data.get("date_read_after_seconds"),
-                    tapbacks=[
-                        Tapback(type=tb["type"], by=tb["by"]) for tb in msg_data.get("tapbacks", [])
-                    ],
-                    text_length=msg_data.get("text_length", 0),
-                    word_count=msg_data.get("word_count", 0),
-                    punctuation_count=msg_data.get("punctuation_count", 0),
-                    has_question=msg_data.get("has_question", False),
-                    has_exclamation=msg_data.get("has_exclamation", False),
-                    has_link=msg_data.get("has_link", False),
-                    emoji_counts=msg_data.get("emoji_counts", {}) or {},
-                )
-                messages.append(message)
+        if suffix == ".jsonl":
+            with open_export(file_path, "rt", compression=compression) as f:
+                record = next(_iter_records(f), None)
+            if record is None:
+                return {}
+            if record.get("type") == "header":
+                return record
+            return {name: record[name] for name in _V1_EXPORT_FIELDS if name in record}
+        elif suffix == ".json":
+            fields = {}
+            with open_export(file_path, "rt", compression=compression) as f:
+                reader = JSONStreamReader(f)
+                for key in reader.iter_object():
+                    if key == "conversations":
+                        # Later fields would cost a full read; the source
+                        # fingerprint is written ahead of the conversations.
+                        break
+                    fields[key] = reader.value()
+            return fields
+        elif suffix == COLUMNAR_SUFFIX:
+            with open_export(file_path, "rb", compression=compression) as f:
+                return read_columnar_header(f)
+        raise ValueError(f"Unsupported file format: {suffix}")
 
-            conversation = Conversation(
-                chat_id=0,
-                chat_identifier=conv_data["chat_identifier"],
-                display_name=conv_data.get("display_name"),
-                is_group_chat=conv_data["is_group_chat"],
-                participants=conv_data["participants"],
-                messages=messages,
-            )
-            conversations[conv_key] = conversation
+    @staticmethod
+    def iter_messages(
+        file_path: str | Path, where: MessageFilter | None = None
+    ) -> Iterator[tuple[str, Message]]:
+        """
+        Stream ``(conversation_key, message)`` pairs matching ``where``.
 
-        return ExportData(
-            export_date=export_date,
-            year=year,
-            conversations=conversations,
-            user_name=user_name,
-            phrases=phrases,
-            phrases_by_contact=phrases_by_contact,
-            sentiment=sentiment,
-        )
+        JSONL exports are read line by line and non-matching records are skipped
+        from their raw text where possible, so neither the whole export nor the
+        rejected messages are ever materialized. With an `.idx` sidecar only the
+        byte spans of matching conversations/months are read at all. Other
+        formats are loaded and then filtered.
+        """
+
+        file_path = Path(file_path)
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"Export file not found: {file_path}")
+
+        if export_suffix(file_path) != ".jsonl":
+            data = ExportLoader.load(file_path, where=where)
+            for key, conversation in data.conversations.items():
+                for message in conversation.messages:
+                    yield key, message
+            return
+
+        compression = compression_for(file_path)
+        lines = _indexed_lines(file_path, where) if compression is None else None
+        if lines is not None:
+            yield from _iter_jsonl_messages(lines, where)
+            return
+        with open_export(file_path, "rt", compression=compression) as f:
+            yield from _iter_jsonl_messages(f, where)
 
     @staticmethod
-    def load(file_path: str | Path) -> ExportData:
+    def load(
+        file_path: str | Path,
+        *,
+        workers: int | None = 1,
+        where: MessageFilter | None = None,
+    ) -> ExportData:
         file_path = Path(file_path)
+        suffix = export_suffix(file_path)
 
-        if file_path.suffix == ".jsonl":
-            return ExportLoader.load_from_jsonl(file_path)
-        elif file_path.suffix == ".json":
-            return ExportLoader.load_from_json(file_path)
+        if suffix == ".jsonl":
+            return ExportLoader.load_from_jsonl(file_path, workers=workers, where=where)
+        elif suffix == ".json":
+            return ExportLoader.load_from_json(file_path, where=where)
+        elif suffix == COLUMNAR_SUFFIX:
+            data = ExportLoader.load_from_columnar(file_path)
         else:
-            raise ValueError(f"Unsupported file format: {file_path.suffix}. Use .json or .jsonl")
+            raise ValueError(
+                f"Unsupported file format: {suffix}. "
+                f"Use .json, .jsonl or {COLUMNAR_SUFFIX}, optionally with .gz or .zst"
+            )
+        return data if where is None else _filter_export(data, where)
@@ -28,6 +28,8 @@ class Message:
     has_exclamation: bool = False
     has_link: bool = False
     emoji_counts: dict[str, int] = field(default_factory=dict)
+    # Word token ids from `token_streams.TokenVocabulary`, stored in place of text.
+    token_ids: list[int] | None = None
 
     @property
     def timestamp_iso(self) -> str:
@@ -61,6 +63,8 @@ class ExportData:
     phrases: dict | None = None
     phrases_by_contact: list[dict] | None = None
     sentiment: dict | None = None
+    # Fingerprint of the chat.db state the export was built from (see export_cache).
+    source: dict | None = None
 
     @property
     def total_messages(self) -> int:
@@ -2,6 +2,7 @@ from typing import Any, Tuple
 
 from .models import Conversation, ExportData, Message
 from .phrases import PhraseExtractionConfig, PhraseExtractor
+from .token_streams import TokenVocabulary
 
 
 def _filter_year_messages(conversation: Conversation, year: int) -> list[Message]:
@@ -13,19 +14,31 @@ def _filter_year_messages(conversation: Conversation, year: int) -> list[Message
 
 
 def compute_phrases_for_export(
-    data: ExportData, phrase_config: PhraseExtractionConfig | None = None
+    data: ExportData,
+    phrase_config: PhraseExtractionConfig | None = None,
+    vocabulary: TokenVocabulary | None = None,
 ) -> Tuple[dict[str, Any], list[dict[str, Any]]]:
+    """
+    Public phrase summary of the messages you sent.
+
+    With a ``vocabulary``, phrases are computed from the messages' stored token
+    ids instead of their text, so an export can be re-tuned without chat.db.
+    """
+
     extractor = PhraseExtractor(config=phrase_config)
 
     texts = []
     for conv in data.conversations.values():
-        conv_texts = []
         for msg in _filter_year_messages(conv, data.year):
-            text = (msg.text or "").strip()
-            if not text or not msg.is_from_me:
+            if not msg.is_from_me:
                 continue
-            texts.append(text)
-            conv_texts.append(text)
+            if vocabulary is not None:
+                if msg.token_ids is not None:
+                    texts.append(vocabulary.decode(msg.token_ids))
+                continue
+            text = (msg.text or "").strip()
+            if text:
+                texts.append(text)
 
     if not texts:
         return {}, []
@@ -34,6 +47,7 @@ def compute_phrases_for_export(
         texts,
         per_contact_messages=None,
         contact_names=None,
+        pretokenized=vocabulary is not None,
     )
 
     if not result.overall:
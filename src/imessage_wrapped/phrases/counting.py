@@ -0,0 +1,308 @@
+"""
+Integer-ID n-gram counting for phrase extraction.
+
+Building every candidate n-gram as a joined string and re-validating it token by
+token dominates phrase extraction. Here tokens are interned into a `Vocabulary`
+once, together with the per-token facts the phrase filters need (length, has a
+letter, is a stopword, is in the filter bank). Windows are validated from a
+per-message prefix sum of those facts and counted under tuples of token ids;
+phrase strings are only built for n-grams that survive the occurrence threshold.
+
+`NgramCounter.count_levelwise` additionally prunes Apriori-style: an n-gram
+occurs at most as often as either of its (n-1)-gram sub-windows, so only
+windows whose two sub-windows both reached the threshold are counted at the
+next length. Most long n-grams in chat text are unique and never get a counter.
+
+`NgramCounter.count_heavy_hitters` bounds memory outright for corpora whose
+distinct n-grams don't fit: a Misra-Gries summary (the deterministic sibling of
+Space-Saving) tracks at most ``capacity`` candidates, then a second pass counts
+occurrences and document frequencies of just those exactly.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from itertools import accumulate, chain, compress
+from operator import and_, sub
+from typing import Collection, Iterable, Sequence
+
+__all__ = ["NgramCounter", "Vocabulary"]
+
+
+class Vocabulary:
+    """Token <-> integer id table with per-token filter facts."""
+
+    def __init__(self, stopwords: Collection[str], filter_bank: Collection[str]) -> None:
+        self._stopwords = stopwords
+        self._filter_bank = set(filter_bank)
+        self._ids: dict[str, int] = {}
+        self.tokens: list[str] = []
+        self.lengths: list[int] = []
+        self.has_letter: list[bool] = []
+        self.is_stopword: list[bool] = []
+        self.is_filtered: list[bool] = []
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def _add(self, token: str) -> int:
+        token_id = len(self.tokens)
+        self._ids[token] = token_id
+        self.tokens.append(token)
+        self.lengths.append(len(token))
+        self.has_letter.append(any(char.isalpha() for char in token))
+        self.is_stopword.append(token in self._stopwords)
+        self.is_filtered.append(token in self._filter_bank)
+        return token_id
+
+    def encode(self, tokens: Iterable[str]) -> list[int]:
+        get = self._ids.get
+        ids = []
+        for token in tokens:
+            token_id = get(token)
+            if token_id is None:
+                token_id = self._add(token)
+            ids.append(token_id)
+        return ids
+
+    def decode(self, ids: Sequence[int]) -> str:
+        tokens = self.tokens
+        return " ".join([tokens[token_id] for token_id in ids])
+
+
+class _WindowValidity(dict):
+    """Memoized ``packed window facts -> is valid`` lookup (see `NgramCounter`)."""
+
+    def __init__(self, base: int, min_characters: int, contains_letters: bool) -> None:
+        super().__init__()
+        self._base = base
+        self._min_characters = min_characters
+        self._contains_letters = contains_letters
+
+    def __missing__(self, facts: int) -> bool:
+        base = self._base
+        valid = (
+            (facts % base > 0 or not self._contains_letters)
+            and facts // base % base > 0
+            and facts // base**2 % base == 0
+            and facts // base**3 >= self._min_characters
+        )
+        self[facts] = valid
+        return valid
+
+
+class NgramCounter:
+    """
+    Count valid n-grams (and the number of documents containing them) over
+    token id sequences.
+
+    A window is valid when its tokens add up to at least ``min_characters``,
+    it contains a letter (if ``contains_letters``), none of its tokens is in
+    the filter bank and not all of them are stopwords.
+    """
+
+    def __init__(
+        self,
+        vocabulary: Vocabulary,
+        ngram_range: tuple[int, int],
+        *,
+        min_characters: int,
+        contains_letters: bool = True,
+    ) -> None:
+        min_n, max_n = ngram_range
+        self.vocabulary = vocabulary
+        self._ngram_range = (min_n, max_n)
+        self._min_characters = min_characters
+        self.counts: Counter[tuple[int, ...]] = Counter()
+        self.doc_frequencies: Counter[tuple[int, ...]] = Counter()
+        self.documents = 0
+
+        # Each token's facts are packed into one mixed-radix integer: letter,
+        # non-stopword and filter-bank counts plus its length clamped to
+        # min_characters (a window reaches min_characters with clamped lengths
+        # exactly when it does with real ones). A window's facts are then the
+        # difference of two prefix sums with every field below `base`, so only
+        # a handful of distinct sums occur and their validity is memoized.
+        base = max_n * max(1, min_characters) + 1
+        self._base = base
+        self._facts: list[int] = []
+        self._validity = _WindowValidity(base, min_characters, contains_letters)
+
+    def _sync_facts(self) -> list[int]:
+        facts = self._facts
+        vocabulary = self.vocabulary
+        if len(facts) < len(vocabulary):
+            base, min_characters = self._base, self._min_characters
+            for token_id in range(len(facts), len(vocabulary)):
+                facts.append(
+                    vocabulary.has_letter[token_id]
+                    + (not vocabulary.is_stopword[token_id]) * base
+                    + vocabulary.is_filtered[token_id] * base**2
+                    + min(vocabulary.lengths[token_id], min_characters) * base**3
+                )
+        return facts
+
+    def add(self, tokens: Sequence[str]) -> None:
+        self.add_ids(self.vocabulary.encode(tokens))
+
+    def add_ids(self, ids: Sequence[int]) -> None:
+        self.documents += 1
+        keys = self.window_keys(ids)
+        if keys:
+            self.counts.update(keys)
+            self.doc_frequencies.update(set(keys))
+
+    def count_levelwise(self, documents: Sequence[Sequence[int]], min_occurrences: int) -> None:
+        """
+        Count ``documents`` one n-gram length at a time, skipping windows that
+        cannot reach ``min_occurrences``.
+
+        Only n-grams occurring at least ``min_occurrences`` times are recorded,
+        with the same counts and document frequencies `add_ids` would give them.
+        Pruning uses occurrence counts of every window, valid or not: validity
+        isn't inherited (``"i am home"`` is a phrase, ``"i am"`` is not), but
+        occurrence counts are.
+        """
+
+        min_n, max_n = self._ngram_range
+        self.documents += len(documents)
+        is_filtered = self.vocabulary.is_filtered
+        facts = self._sync_facts()
+        is_valid = self._validity.__getitem__
+        counts, doc_frequencies = self.counts, self.doc_frequencies
+
+        # Frequent tokens, counted as plain ids. Filter-bank tokens drop out here:
+        # no window containing one is valid.
+        token_counts = Counter(chain.from_iterable(documents))
+        frequent_tokens = {
+            token_id
+            for token_id, count in token_counts.items()
+            if count >= min_occurrences and not is_filtered[token_id]
+        }
+        if min_n == 1:
+            valid_tokens = {token_id for token_id in frequent_tokens if is_valid(facts[token_id])}
+            for token_id in valid_tokens:
+                counts[(token_id,)] = token_counts[token_id]
+            for ids in documents:
+                doc_frequencies.update((token_id,) for token_id in valid_tokens.intersection(ids))
+        del token_counts
+
+        # (ids, alive) per document still in play: alive[i] says whether the
+        # window of the previous length starting at i is frequent.
+        surviving = []
+        for ids in documents:
+            alive = list(map(frequent_tokens.__contains__, ids))
+            if len(ids) > 1 and any(alive):
+                surviving.append((ids, alive))
+
+        for n in range(2, max_n + 1):
+            level_counts: Counter[tuple[int, ...]] = Counter()
+            candidates = []
+            for ids, alive in surviving:
+                mask = list(map(and_, alive, alive[1:]))
+                if any(mask):
+                    windows = list(zip(*[ids[offset:] for offset in range(n)]))
+                    level_counts.update(compress(windows, mask))
+                    candidates.append((ids, windows))
+
+            frequent = {key for key, count in level_counts.items() if count >= min_occurrences}
+            if n >= min_n:
+                valid = {key for key in frequent if is_valid(sum(map(facts.__getitem__, key)))}
+                for key in valid:
+                    counts[key] = level_counts[key]
+                if valid:
+                    for _, windows in candidates:
+                        doc_frequencies.update(valid.intersection(windows))
+            del level_counts
+            if n == max_n:
+                break
+
+            surviving = []
+            for ids, windows in candidates:
+                if len(windows) > 1:
+                    alive = list(map(frequent.__contains__, windows))
+                    if any(alive):
+                        surviving.append((ids, alive))
+            if not surviving:
+                break
+
+    def count_heavy_hitters(self, documents: Sequence[Sequence[int]], capacity: int) -> int:
+        """
+        Count ``documents`` holding at most ~``2 * capacity`` n-grams at once.
+
+        The first pass keeps a Misra-Gries summary: whenever it grows past
+        ``2 * capacity`` entries, every count drops by the ``capacity + 1``-th
+        largest one and non-positive entries are evicted. Each n-gram loses at
+        most ``N / (capacity + 1)`` that way (N = valid windows counted), so any
+        n-gram occurring more often than that is still tracked at the end. The
+        second pass records exact counts and document frequencies for the
+        tracked n-grams only; rarer ones may be missing.
+
+        Returns the bound ``N // (capacity + 1)``.
+        """
+
+        summary: Counter[tuple[int, ...]] = Counter()
+        windows = 0
+        for ids in documents:
+            keys = self.window_keys(ids)
+            windows += len(keys)
+            summary.update(keys)
+            if len(summary) > 2 * capacity:
+                summary = _decrement_summary(summary, capacity)
+        tracked = set(summary)
+        del summary
+
+        self.documents += len(documents)
+        counts, doc_frequencies = self.counts, self.doc_frequencies
+        for ids in documents:
+            keys = self.window_keys(ids)
+            hits = list(compress(keys, map(tracked.__contains__, keys)))
+            if hits:
+                counts.update(hits)
+                doc_frequencies.update(set(hits))
+        return windows // (capacity + 1)
+
+    def is_valid(self, ids: Sequence[int]) -> bool:
+        """Whether the window ``ids`` (at most ``ngram_range[1]`` tokens) is a phrase."""
+
+        facts = self._sync_facts()
+        return self._validity[sum(map(facts.__getitem__, ids))]
+
+    def window_keys(self, ids: Sequence[int]) -> list[tuple[int, ...]]:
+        """Every valid n-gram of ``ids``, shortest first, in window order."""
+
+        min_n, max_n = self._ngram_range
+        length = len(ids)
+        if length < min_n:
+            return []
+        facts = self._sync_facts()
+        prefix = [0, *accumulate(map(facts.__getitem__, ids))]
+        is_valid = self._validity.__getitem__
+
+        keys: list[tuple[int, ...]] = []
+        for n in range(min_n, min(max_n, length) + 1):
+            windows = zip(*[ids[offset:] for offset in range(n)])
+            keys.extend(compress(windows, map(is_valid, map(sub, prefix[n:], prefix))))
+        return keys
+
+    def phrase_counts(self, min_occurrences: int = 1) -> tuple[dict[str, int], dict[str, int]]:
+        """Materialize ``(counts, doc_frequencies)`` keyed by phrase text."""
+
+        decode = self.vocabulary.decode
+        doc_frequencies = self.doc_frequencies
+        counts: dict[str, int] = {}
+        frequencies: dict[str, int] = {}
+        for key, count in self.counts.items():
+            if count >= min_occurrences:
+                phrase = decode(key)
+                counts[phrase] = count
+                frequencies[phrase] = doc_frequencies[key]
+        return counts, frequencies
+
+
+def _decrement_summary(summary: Counter, capacity: int) -> Counter:
+    """Subtract the ``capacity + 1``-th largest count from every entry, keeping positives."""
+
+    threshold = heapq.nlargest(capacity + 1, summary.values())[-1]
+    return Counter({key: count - threshold for key, count in summary.items() if count > threshold})
@@ -0,0 +1,88 @@
+"""
+Overlap deduplication for ranked phrases.
+
+`dedupe_overlaps` makes the same keep/drop decisions as comparing every
+candidate against every kept phrase, without the pairwise scans:
+
+1. A candidate is dropped when an earlier kept phrase contains it (as a
+   substring) with an occurrence count within tolerance. Whenever a phrase is
+   kept, each of its substrings that is itself a candidate text is indexed,
+   so checking a candidate is a single lookup.
+2. A surviving phrase is dropped when its words appear contiguously in a
+   longer surviving phrase. Every contiguous word window of the survivors is
+   indexed with the longest text containing it.
+
+Both passes are linear in the number of phrases (times a bound on phrase
+length). The alternative strategies in `extractor_improved` reuse both indexes.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, Sequence
+
+from .scoring import ScoredPhrase
+
+__all__ = ["dedupe_overlaps", "drop_contained", "indexed_substrings", "word_windows"]
+
+
+def dedupe_overlaps(scored: Sequence[ScoredPhrase], overlap_tolerance: float) -> list[ScoredPhrase]:
+    """Drop ranked phrases that repeat a higher-ranked or longer kept phrase."""
+
+    filtered = drop_contained(scored, overlap_tolerance)
+
+    # word window -> length of the longest surviving text containing it.
+    longest: dict[tuple[str, ...], int] = {}
+    for phrase in filtered:
+        size = len(phrase.text)
+        for window in word_windows(phrase.text.split()):
+            if longest.get(window, -1) < size:
+                longest[window] = size
+    return [
+        phrase for phrase in filtered if longest[tuple(phrase.text.split())] <= len(phrase.text)
+    ]
+
+
+def drop_contained(scored: Sequence[ScoredPhrase], overlap_tolerance: float) -> list[ScoredPhrase]:
+    """Pass 1: drop candidates contained in a kept phrase with a count within tolerance."""
+
+    texts = {item.text for item in scored}
+    lengths = sorted({len(text) for text in texts})
+
+    # text -> (occurrences, tolerance) of every kept phrase containing it.
+    containers: dict[str, list[tuple[int, int]]] = {}
+    filtered: list[ScoredPhrase] = []
+    for candidate in scored:
+        occurrences = candidate.occurrences
+        if any(
+            abs(kept - occurrences) <= tolerance
+            for kept, tolerance in containers.get(candidate.text, ())
+        ):
+            continue
+        filtered.append(candidate)
+        entry = (occurrences, max(1, int(occurrences * overlap_tolerance)))
+        for substring in indexed_substrings(candidate.text, texts, lengths):
+            containers.setdefault(substring, []).append(entry)
+    return filtered
+
+
+def word_windows(words: Sequence[str]) -> Iterator[tuple[str, ...]]:
+    """Every contiguous run of ``words``, the empty run included."""
+
+    for start in range(len(words) + 1):
+        for stop in range(start, len(words) + 1):
+            yield tuple(words[start:stop])
+
+
+def indexed_substrings(text: str, texts: set[str], lengths: list[int]) -> Iterator[str]:
+    """Distinct substrings of ``text`` that are themselves in ``texts``."""
+
+    seen = set()
+    size = len(text)
+    for start in range(size + 1):
+        for length in lengths:
+            if length > size - start:
+                break
+            substring = text[start : start + length]
+            if substring in texts and substring not in seen:
+                seen.add(substring)
+                yield substring
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
-from collections import Counter
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from functools import lru_cache
 from importlib import resources
-from typing import Iterable, Mapping, Sequence
+from typing import Iterable, Mapping, Sequence, cast
 
+from .counting import NgramCounter, Vocabulary
+from .extractor_improved import DEDUPE_STRATEGIES
 from .scoring import FrequencyScorer, ScoredPhrase, TfIdfScorer
+from .suffix_array import maximal_repeats
 from .tokenizer import SimpleTokenizer, TokenizedMessage
 
 STOPWORDS_PACKAGE = "imessage_wrapped.phrases.resources"
 STOPWORDS_FILE = "stopwords_en.txt"
+# Below this many per-contact messages process start-up costs more than extracting
+# contacts in parallel saves.
+PARALLEL_MIN_MESSAGES = 20_000
 
 __all__ = [
     "PhraseExtractionConfig",
@@ -54,9 +61,16 @@ class PhraseExtractionConfig:
     max_phrases: int = 12  # number of phrases to return
     per_contact_limit: int = 500
     scoring: str = "tfidf"  # or "tfidf" / "frequency"
+    engine: str = "ngram"  # or "suffix_array": maximal repeats only, no dedupe pass
     dedupe_overlap: bool = True
+    dedupe_strategy: str = "default"  # any key of extractor_improved.DEDUPE_STRATEGIES
     overlap_tolerance: float = 0.2
     contains_letters: bool = True
+    levelwise_counting: bool = True  # Apriori pruning of n-grams below min_occurrences
+    # Approximate counting for huge corpora: hold at most ~2x this many n-grams. Phrases
+    # occurring more than (n-gram windows) / (cap + 1) times are always found, with
+    # exact counts; rarer ones may be missed. None counts everything exactly.
+    max_tracked_phrases: int | None = None
     length_bias: float = 2.0
     phrase_filter_bank: list[str] = field(default_factory=lambda: ["http", "https"])
 
@@ -78,12 +92,20 @@ class PhraseExtractionConfig:
             raise ValueError("max_phrases must be >= 1")
         if self.scoring not in {"frequency", "tfidf"}:
             raise ValueError("scoring must be 'frequency' or 'tfidf'")
+        if self.engine not in {"ngram", "suffix_array"}:
+            raise ValueError("engine must be 'ngram' or 'suffix_array'")
+        if self.dedupe_strategy not in DEDUPE_STRATEGIES:
+            raise ValueError(f"dedupe_strategy must be one of {', '.join(DEDUPE_STRATEGIES)}")
         if self.per_contact_limit < 0:
             raise ValueError("per_contact_limit must be >= 0")
         if self.length_bias < 0:
             raise ValueError("length_bias must be >= 0")
         if not isinstance(self.contains_letters, bool):
             raise ValueError("contains_letters must be a boolean")
+        if not isinstance(self.levelwise_counting, bool):
+            raise ValueError("levelwise_counting must be a boolean")
+        if self.max_tracked_phrases is not None and self.max_tracked_phrases < 1:
+            raise ValueError("max_tracked_phrases must be >= 1")
         if self.length_bias < 0:
             raise ValueError("length_bias must be >= 0")
         if not isinstance(self.phrase_filter_bank, list):
@@ -110,30 +132,65 @@ class PhraseExtractor:
 
     def extract(
         self,
-        messages: Sequence[str],
+        messages: Sequence[str] | Sequence[Sequence[str]],
         *,
-        per_contact_messages: Mapping[str, Sequence[str]] | None = None,
+        per_contact_messages: Mapping[str, Sequence[str] | Sequence[Sequence[str]]] | None = None,
         contact_names: Mapping[str, str] | None = None,
+        workers: int | None = 1,
+        pretokenized: bool = False,
     ) -> PhraseExtractionResult:
-        overall_stats = self._extract_bucket(messages, min_messages=self._config.min_text_messages)
-
+        """
+        Extract the top phrases overall and per contact.
+
+        Args:
+            workers: Worker processes for the per-contact buckets; None uses
+                every core. Contacts are only farmed out once they add up to
+                ``PARALLEL_MIN_MESSAGES`` messages.
+            pretokenized: Messages are already token lists (for example decoded
+                from an export's token ids). Every list counts as a message,
+                empty or not; blank texts are only skipped for raw strings.
+        """
+
+        contact_names = contact_names or {}
+        overall_stats = None
         contact_results: list[ContactPhraseStats] = []
         if per_contact_messages:
-            for contact_id, contact_msgs in per_contact_messages.items():
-                bucket = self._extract_bucket(
-                    contact_msgs,
-                    min_messages=(
-                        self._config.per_contact_min_text_messages or self._config.min_text_messages
-                    ),
-                )
-                contact_results.append(
-                    ContactPhraseStats(
-                        contact_id=contact_id,
-                        contact_name=(contact_names or {}).get(contact_id),
-                        total_messages=bucket.total_messages,
-                        top_phrases=self._contact_phrase_slice(bucket.top_phrases),
+            workers = workers or os.cpu_count() or 1
+            total = sum(len(contact_msgs) for contact_msgs in per_contact_messages.values())
+            if workers > 1 and len(per_contact_messages) > 1 and total >= PARALLEL_MIN_MESSAGES:
+                with ProcessPoolExecutor(
+                    max_workers=min(workers, len(per_contact_messages)),
+                    initializer=_init_contact_worker,
+                    initargs=(self._config, self._stopwords, self._tokenizer),
+                ) as executor:
+                    # Largest buckets first, so the biggest conversation never starts last.
+                    futures = {
+                        contact_id: executor.submit(
+                            _contact_stats_in_worker,
+                            contact_id,
+                            contact_msgs,
+                            contact_names.get(contact_id),
+                            pretokenized,
+                        )
+                        for contact_id, contact_msgs in sorted(
+                            per_contact_messages.items(), key=lambda item: -len(item[1])
+                        )
+                    }
+                    # The overall bucket is extracted here while the workers run.
+                    overall_stats = self._extract_bucket(
+                        messages,
+                        min_messages=self._config.min_text_messages,
+                        pretokenized=pretokenized,
+                    )
+                    stats = {contact_id: future.result() for contact_id, future in futures.items()}
+                contact_results = [stats[contact_id] for contact_id in per_contact_messages]
+            else:
+                contact_results = [
+                    self._contact_stats(
+                        contact_id, contact_msgs, contact_names.get(contact_id), pretokenized
                     )
-                )
+                    for contact_id, contact_msgs in per_contact_messages.items()
+                ]
 
             contact_results.sort(
                 key=lambda item: (
@@ -143,6 +200,10 @@ class PhraseExtractor:
                 reverse=True,
             )
 
+        if overall_stats is None:
+            overall_stats = self._extract_bucket(
+                messages, min_messages=self._config.min_text_messages, pretokenized=pretokenized
+            )
         return PhraseExtractionResult(
             overall=overall_stats.top_phrases[: self._config.max_phrases],
             by_contact=contact_results,
@@ -150,23 +211,50 @@ class PhraseExtractor:
             config=self._config,
         )
 
+    def _contact_stats(
+        self,
+        contact_id: str,
+        messages: Sequence[str] | Sequence[Sequence[str]],
+        contact_name: str | None,
+        pretokenized: bool = False,
+    ) -> ContactPhraseStats:
+        bucket = self._extract_bucket(
+            messages,
+            min_messages=(
+                self._config.per_contact_min_text_messages or self._config.min_text_messages
+            ),
+            pretokenized=pretokenized,
+        )
+        return ContactPhraseStats(
+            contact_id=contact_id,
+            contact_name=contact_name,
+            total_messages=bucket.total_messages,
+            top_phrases=self._contact_phrase_slice(bucket.top_phrases),
+        )
+
     def _extract_bucket(
         self,
-        messages: Sequence[str],
+        messages: Sequence[str] | Sequence[Sequence[str]],
         *,
         min_messages: int | None = None,
+        pretokenized: bool = False,
     ) -> "PhraseBucket":
-        tokenized = self._tokenizer.tokenize_messages(messages)
+        if pretokenized:
+            tokenized = [TokenizedMessage(tokens=list(tokens)) for tokens in messages]
+        else:
+            tokenized = self._tokenizer.tokenize_messages(cast(Sequence[str], messages))
         min_required = min_messages if min_messages is not None else self._config.min_text_messages
         if len(tokenized) < min_required:
             return PhraseBucket(total_messages=len(tokenized), top_phrases=[])
 
-        counts, doc_frequencies, total_docs = self._count_phrases(tokenized)
-        filtered_counts = {
-            phrase: count
-            for phrase, count in counts.items()
-            if count >= self._config.min_occurrences
-        }
+        count_phrases = (
+            self._count_maximal_repeats
+            if self._config.engine == "suffix_array"
+            else self._count_phrases
+        )
+        filtered_counts, doc_frequencies, total_docs = count_phrases(
+            tokenized, min_occurrences=self._config.min_occurrences
+        )
         if not filtered_counts:
             return PhraseBucket(total_messages=len(tokenized), top_phrases=[])
 
@@ -183,7 +271,8 @@ class PhraseExtractor:
             reverse=True,
         )
 
-        if self._config.dedupe_overlap:
+        # Maximal repeats never contain a sub-phrase with the same occurrences.
+        if self._config.dedupe_overlap and self._config.engine == "ngram":
             ranked = self._dedupe_overlaps(ranked)
 
         phrase_stats = [
@@ -205,93 +294,62 @@ class PhraseExtractor:
     def _count_phrases(
         self,
         tokenized_messages: Sequence[TokenizedMessage],
-    ) -> tuple[Counter[str], dict[str, int], int]:
-        counts: Counter[str] = Counter()
-        doc_frequencies: dict[str, int] = {}
-
-        for message in tokenized_messages:
-            seen_in_message: set[str] = set()
-            tokens = message.tokens
-            for phrase in self._generate_phrases(tokens):
-                counts[phrase] += 1
-                if phrase not in seen_in_message:
-                    doc_frequencies[phrase] = doc_frequencies.get(phrase, 0) + 1
-                    seen_in_message.add(phrase)
-
-        return counts, doc_frequencies, len(tokenized_messages)
-
-    def _generate_phrases(self, tokens: Sequence[str]) -> Iterable[str]:
+        *,
+        min_occurrences: int = 1,
+    ) -> tuple[dict[str, int], dict[str, int], int]:
+        counter = self._new_counter()
+        encode = counter.vocabulary.encode
+        if self._config.max_tracked_phrases is not None:
+            documents = [encode(message.tokens) for message in tokenized_messages]
+            counter.count_heavy_hitters(documents, self._config.max_tracked_phrases)
+        elif self._config.levelwise_counting and min_occurrences > 1:
+            documents = [encode(message.tokens) for message in tokenized_messages]
+            counter.count_levelwise(documents, min_occurrences)
+        else:
+            for message in tokenized_messages:
+                counter.add(message.tokens)
+        counts, doc_frequencies = counter.phrase_counts(min_occurrences)
+        return counts, doc_frequencies, counter.documents
+
+    def _count_maximal_repeats(
+        self,
+        tokenized_messages: Sequence[TokenizedMessage],
+        *,
+        min_occurrences: int = 1,
+    ) -> tuple[dict[str, int], dict[str, int], int]:
+        counter = self._new_counter()
+        vocabulary = counter.vocabulary
+        documents = [vocabulary.encode(message.tokens) for message in tokenized_messages]
+        separators = {token_id for token_id, hit in enumerate(vocabulary.is_filtered) if hit}
         min_n, max_n = self._config.ngram_range
-        length = len(tokens)
-        for n in range(min_n, max_n + 1):
-            if length < n:
-                continue
-            for idx in range(length - n + 1):
-                window = tokens[idx : idx + n]
-                if not self._valid_ngram(window):
-                    continue
-                yield " ".join(window)
-
-    def _valid_ngram(self, tokens: Sequence[str]) -> bool:
-        if not tokens:
-            return False
-        characters = sum(len(token) for token in tokens)
-        if characters < self._config.min_characters:
-            return False
-        if self._config.contains_letters:
-            has_letter = any(any(char.isalpha() for char in token) for token in tokens)
-            if not has_letter:
-                return False
-        if self._config.phrase_filter_bank:
-            has_filter = any(token in self._config.phrase_filter_bank for token in tokens)
-            if has_filter:
-                return False
-        if all(token in self._stopwords for token in tokens):
-            return False
-        return True
+
+        counts: dict[str, int] = {}
+        doc_frequencies: dict[str, int] = {}
+        for repeat in maximal_repeats(
+            documents,
+            min_length=min_n,
+            max_length=max_n,
+            min_occurrences=min_occurrences,
+            separators=separators,
+        ):
+            if counter.is_valid(repeat.ids):
+                phrase = vocabulary.decode(repeat.ids)
+                counts[phrase] = repeat.occurrences
+                doc_frequencies[phrase] = repeat.documents
+        return counts, doc_frequencies, len(documents)
+
+    def _new_counter(self) -> NgramCounter:
+        vocabulary = Vocabulary(self._stopwords, self._config.phrase_filter_bank)
+        return NgramCounter(
+            vocabulary,
+            self._config.ngram_range,
+            min_characters=self._config.min_characters,
+            contains_letters=self._config.contains_letters,
+        )
 
     def _dedupe_overlaps(self, scored: Sequence[ScoredPhrase]) -> list[ScoredPhrase]:
-        filtered: list[ScoredPhrase] = []
-        for candidate in scored:
-            skip = False
-            for kept in filtered:
-                if self._phrases_overlap(kept.text, candidate.text):
-                    count_delta = abs(kept.occurrences - candidate.occurrences)
-                    tolerance = max(1, int(kept.occurrences * self._config.overlap_tolerance))
-                    if len(candidate.text) <= len(kept.text) and count_delta <= tolerance:
-                        skip = True
-                        break
-            if not skip:
-                filtered.append(candidate)
-
-        result: list[ScoredPhrase] = []
-        for phrase in filtered:
-            is_subset = False
-            for other in filtered:
-                if phrase != other and phrase.text != other.text:
-                    if self._is_phrase_subset(phrase.text, other.text):
-                        is_subset = True
-                        break
-            if not is_subset:
-                result.append(phrase)
-        return result
-
-    @staticmethod
-    def _is_phrase_subset(shorter: str, longer: str) -> bool:
-        if len(shorter) >= len(longer):
-            return False
-        shorter_words = shorter.split()
-        longer_words = longer.split()
-        if len(shorter_words) > len(longer_words):
-            return False
-        for i in range(len(longer_words) - len(shorter_words) + 1):
-            if longer_words[i : i + len(shorter_words)] == shorter_words:
-                return True
-        return False
-
-    @staticmethod
-    def _phrases_overlap(left: str, right: str) -> bool:
-        return left in right or right in left
+        dedupe = DEDUPE_STRATEGIES[self._config.dedupe_strategy]
+        return dedupe(scored, self._config.overlap_tolerance)
 
     def _build_stopword_set(self, stopwords: Iterable[str] | None) -> set[str]:
         if stopwords is not None:
@@ -316,6 +374,26 @@ class PhraseBucket:
     top_phrases: list[PhraseStat]
 
 
+_worker_extractor: PhraseExtractor | None = None
+
+
+def _init_contact_worker(
+    config: PhraseExtractionConfig, stopwords: set[str], tokenizer: SimpleTokenizer
+) -> None:
+    global _worker_extractor
+    _worker_extractor = PhraseExtractor(config=config, stopwords=stopwords, tokenizer=tokenizer)
+
+
+def _contact_stats_in_worker(
+    contact_id: str,
+    messages: Sequence[str] | Sequence[Sequence[str]],
+    contact_name: str | None,
+    pretokenized: bool,
+) -> ContactPhraseStats:
+    assert _worker_extractor is not None, "Worker not initialized"
+    return _worker_extractor._contact_stats(contact_id, messages, contact_name, pretokenized)
+
+
 @lru_cache(maxsize=1)
 def _load_stopwords() -> set[str]:
     base = resources.files(STOPWORDS_PACKAGE)
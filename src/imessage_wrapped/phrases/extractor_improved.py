@@ -2,13 +2,28 @@
 Improved phrase deduplication strategies.
 
 This module contains different approaches to balance removing redundant phrases
-while keeping meaningful variations.
+while keeping meaningful variations. Each is selectable through
+`PhraseExtractionConfig.dedupe_strategy` (see `DEDUPE_STRATEGIES`).
+
+They share the indexes of `dedupe_overlaps` rather than comparing every pair of
+phrases: the first pass is `drop_contained`, and a subset test against "any
+longer phrase containing these words" only needs the largest occurrence count
+among such phrases, which is tracked per word window and phrase length.
 """
 
-from typing import Sequence
+from typing import Callable, Sequence
 
+from .dedupe import dedupe_overlaps, drop_contained, indexed_substrings, word_windows
 from .scoring import ScoredPhrase
 
+__all__ = [
+    "DEDUPE_STRATEGIES",
+    "dedupe_overlaps_option1_smart_subset",
+    "dedupe_overlaps_option2_no_subset_removal",
+    "dedupe_overlaps_option3_contextual",
+    "dedupe_overlaps_option4_bidirectional",
+]
+
 
 def dedupe_overlaps_option1_smart_subset(
     scored: Sequence[ScoredPhrase],
@@ -21,35 +36,14 @@ def dedupe_overlaps_option1_smart_subset(
     If a subset has similar or more occurrences, keep it as it's likely used independently.
     """
     # First pass: filter obvious overlaps with tolerance
-    filtered: list[ScoredPhrase] = []
-    for candidate in scored:
-        skip = False
-        for kept in filtered:
-            if _phrases_overlap(kept.text, candidate.text):
-                count_delta = abs(kept.occurrences - candidate.occurrences)
-                tolerance = max(1, int(kept.occurrences * overlap_tolerance))
-                if len(candidate.text) <= len(kept.text) and count_delta <= tolerance:
-                    skip = True
-                    break
-        if not skip:
-            filtered.append(candidate)
-
-    # Second pass: only remove subsets that have significantly fewer occurrences
-    result: list[ScoredPhrase] = []
-    for phrase in filtered:
-        is_redundant_subset = False
-        for other in filtered:
-            if phrase != other and phrase.text != other.text:
-                if _is_phrase_subset(phrase.text, other.text):
-                    # Only remove if the subset has less than 80% of the superset's occurrences
-                    count_ratio = phrase.occurrences / max(1, other.occurrences)
-                    if count_ratio < 0.8:
-                        is_redundant_subset = True
-                        break
-        if not is_redundant_subset:
-            result.append(phrase)
+    filtered = drop_contained(scored, overlap_tolerance)
 
-    return result
+    # Second pass: only remove subsets with less than 80% of a superset's occurrences
+    return [
+        phrase
+        for phrase, superset in zip(filtered, _superset_occurrences(filtered))
+        if superset is None or phrase.occurrences / max(1, superset) >= 0.8
+    ]
 
 
 def dedupe_overlaps_option2_no_subset_removal(
@@ -62,20 +56,7 @@ def dedupe_overlaps_option2_no_subset_removal(
     Only remove phrases that overlap AND have similar counts.
     Don't do the second subset removal pass at all.
     """
-    filtered: list[ScoredPhrase] = []
-    for candidate in scored:
-        skip = False
-        for kept in filtered:
-            if _phrases_overlap(kept.text, candidate.text):
-                count_delta = abs(kept.occurrences - candidate.occurrences)
-                tolerance = max(1, int(kept.occurrences * overlap_tolerance))
-                if len(candidate.text) <= len(kept.text) and count_delta <= tolerance:
-                    skip = True
-                    break
-        if not skip:
-            filtered.append(candidate)
-
-    return filtered
+    return drop_contained(scored, overlap_tolerance)
 
 
 def dedupe_overlaps_option3_contextual(
@@ -91,34 +72,14 @@ def dedupe_overlaps_option3_contextual(
     2. The subset has very few occurrences relative to the superset
     """
     # First pass: filter obvious overlaps with tolerance
-    filtered: list[ScoredPhrase] = []
-    for candidate in scored:
-        skip = False
-        for kept in filtered:
-            if _phrases_overlap(kept.text, candidate.text):
-                count_delta = abs(kept.occurrences - candidate.occurrences)
-                tolerance = max(1, int(kept.occurrences * overlap_tolerance))
-                if len(candidate.text) <= len(kept.text) and count_delta <= tolerance:
-                    skip = True
-                    break
-        if not skip:
-            filtered.append(candidate)
+    filtered = drop_contained(scored, overlap_tolerance)
 
     # Second pass: contextual subset removal
-    result: list[ScoredPhrase] = []
-    for phrase in filtered:
-        should_remove = False
-        for other in filtered:
-            if phrase != other and phrase.text != other.text:
-                if _is_phrase_subset(phrase.text, other.text):
-                    # Remove if superset has significantly more occurrences
-                    if other.occurrences > phrase.occurrences * subset_threshold:
-                        should_remove = True
-                        break
-        if not should_remove:
-            result.append(phrase)
-
-    return result
+    return [
+        phrase
+        for phrase, superset in zip(filtered, _superset_occurrences(filtered))
+        if superset is None or superset <= phrase.occurrences * subset_threshold
+    ]
 
 
 def dedupe_overlaps_option4_bidirectional(
@@ -131,43 +92,68 @@ def dedupe_overlaps_option4_bidirectional(
     Only remove a subset if it's ALSO similar in count to the superset.
     This combines both the overlap logic and subset logic into one pass.
     """
+    texts = {item.text for item in scored}
+    lengths = sorted({len(text) for text in texts})
+    word_keys = {tuple(item.text.split()) for item in scored}
+
+    # A kept phrase can only absorb a candidate no longer than itself, so an overlap
+    # is either the candidate's text inside the kept text or its words inside the
+    # kept phrase's words.
+    containers: dict[str, list[tuple[int, int]]] = {}
+    supersets: dict[tuple[str, ...], list[tuple[int, int, int]]] = {}
     filtered: list[ScoredPhrase] = []
-
     for candidate in scored:
-        skip = False
-        for kept in filtered:
-            # Check for overlap
-            is_overlap = _phrases_overlap(kept.text, candidate.text)
-            is_subset = _is_phrase_subset(candidate.text, kept.text)
-
-            if is_overlap or is_subset:
-                count_delta = abs(kept.occurrences - candidate.occurrences)
-                tolerance = max(1, int(kept.occurrences * overlap_tolerance))
+        occurrences = candidate.occurrences
+        size = len(candidate.text)
+        words = tuple(candidate.text.split())
+        if any(
+            abs(kept - occurrences) <= tolerance
+            for kept, tolerance in containers.get(candidate.text, ())
+        ) or any(
+            size < length and abs(kept - occurrences) <= tolerance
+            for length, kept, tolerance in supersets.get(words, ())
+        ):
+            continue
+        filtered.append(candidate)
+        tolerance = max(1, int(occurrences * overlap_tolerance))
+        for substring in indexed_substrings(candidate.text, texts, lengths):
+            containers.setdefault(substring, []).append((occurrences, tolerance))
+        for window in set(word_windows(words)) & word_keys:
+            supersets.setdefault(window, []).append((size, occurrences, tolerance))
 
-                # Only skip if shorter/smaller AND counts are similar
-                if len(candidate.text) <= len(kept.text) and count_delta <= tolerance:
-                    skip = True
-                    break
+    return filtered
 
-        if not skip:
-            filtered.append(candidate)
 
-    return filtered
+DEDUPE_STRATEGIES: dict[str, Callable[[Sequence[ScoredPhrase], float], list[ScoredPhrase]]] = {
+    "default": dedupe_overlaps,
+    "smart_subset": dedupe_overlaps_option1_smart_subset,
+    "no_subset_removal": dedupe_overlaps_option2_no_subset_removal,
+    "contextual": dedupe_overlaps_option3_contextual,
+    "bidirectional": dedupe_overlaps_option4_bidirectional,
+}
 
 
 # Helper functions
-def _phrases_overlap(left: str, right: str) -> bool:
-    return left in right or right in left
-
-
-def _is_phrase_subset(shorter: str, longer: str) -> bool:
-    if len(shorter) >= len(longer):
-        return False
-    shorter_words = shorter.split()
-    longer_words = longer.split()
-    if len(shorter_words) > len(longer_words):
-        return False
-    for i in range(len(longer_words) - len(shorter_words) + 1):
-        if longer_words[i : i + len(shorter_words)] == shorter_words:
-            return True
-    return False
+def _superset_occurrences(phrases: Sequence[ScoredPhrase]) -> list[int | None]:
+    """
+    For each phrase, the most occurrences of any longer phrase whose words contain
+    its words contiguously, or None when there is no such phrase.
+    """
+    word_keys = [tuple(phrase.text.split()) for phrase in phrases]
+    wanted = set(word_keys)
+
+    # word window -> {text length: most occurrences among phrases of that length}
+    by_window: dict[tuple[str, ...], dict[int, int]] = {}
+    for phrase, words in zip(phrases, word_keys):
+        size = len(phrase.text)
+        for window in set(word_windows(words)) & wanted:
+            best = by_window.setdefault(window, {})
+            if best.get(size, -1) < phrase.occurrences:
+                best[size] = phrase.occurrences
+
+    result: list[int | None] = []
+    for phrase, words in zip(phrases, word_keys):
+        size = len(phrase.text)
+        longer = [count for length, count in by_window[words].items() if length > size]
+        result.append(max(longer) if longer else None)
+    return result
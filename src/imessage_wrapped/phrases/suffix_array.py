@@ -0,0 +1,134 @@
+"""
+Maximal repeated phrases from a suffix array over token ids.
+
+The n-gram engine counts every window in the configured range, so "see you",
+"see you soon" and "you soon" all come back with near-identical counts and
+`PhraseExtractor._dedupe_overlaps` has to prune them again. Here every token
+position of the (id-encoded) messages is a suffix; sorting them and walking
+the longest-common-prefix (LCP) array with a stack enumerates each repeated
+token sequence once, as an LCP interval whose width is its exact occurrence
+count. Only *maximal* repeats are emitted: extending one by a token on either
+side loses at least one occurrence.
+
+Suffixes are ordered by at most ``max_length`` tokens and stop at message
+boundaries and separator tokens, so building the array is a single
+O(N log N) sort of bounded keys whatever the n-gram range, and a repeat that
+would run past ``max_length`` is reported at ``max_length``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Collection, Sequence
+
+__all__ = ["Repeat", "SuffixArray", "build_suffix_array", "maximal_repeats"]
+
+
+@dataclass(frozen=True)
+class Repeat:
+    ids: tuple[int, ...]
+    occurrences: int
+    documents: int
+
+
+@dataclass
+class SuffixArray:
+    """Sorted suffixes: ``keys[k]`` starts at token ``positions[k]`` of document ``owners[k]``."""
+
+    keys: list[tuple[int, ...]]
+    owners: list[int]
+    positions: list[int]
+    lcp: list[int]  # lcp[k]: common prefix of keys[k - 1] and keys[k] (lcp[0] == 0)
+
+
+def build_suffix_array(
+    documents: Sequence[Sequence[int]], max_length: int, separators: Collection[int] = ()
+) -> SuffixArray:
+    """Sort every suffix of ``documents`` that doesn't start with a separator."""
+
+    keys: list[tuple[int, ...]] = []
+    owners: list[int] = []
+    positions: list[int] = []
+    for owner, ids in enumerate(documents):
+        stop = len(ids)
+        # Walk backwards so each suffix knows where the next separator is.
+        for position in range(len(ids) - 1, -1, -1):
+            if ids[position] in separators:
+                stop = position
+                continue
+            keys.append(tuple(ids[position : min(stop, position + max_length)]))
+            owners.append(owner)
+            positions.append(position)
+
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    keys = [keys[index] for index in order]
+    owners = [owners[index] for index in order]
+    positions = [positions[index] for index in order]
+
+    lcp = [0] * len(keys)
+    for index in range(1, len(keys)):
+        common = 0
+        for left, right in zip(keys[index - 1], keys[index]):
+            if left != right:
+                break
+            common += 1
+        lcp[index] = common
+    return SuffixArray(keys, owners, positions, lcp)
+
+
+def maximal_repeats(
+    documents: Sequence[Sequence[int]],
+    *,
+    min_length: int,
+    max_length: int,
+    min_occurrences: int = 2,
+    separators: Collection[int] = (),
+) -> list[Repeat]:
+    """
+    Every maximal repeat of ``min_length`` to ``max_length`` tokens occurring at
+    least ``min_occurrences`` times (overlapping occurrences included), with the
+    number of distinct documents it occurs in.
+    """
+
+    array = build_suffix_array(documents, max_length, separators)
+    keys, owners, positions, lcp = array.keys, array.owners, array.positions, array.lcp
+    min_occurrences = max(2, min_occurrences)
+    repeats: list[Repeat] = []
+
+    def emit(length: int, left: int, right: int) -> None:
+        # Suffixes left..right (inclusive) share exactly `length` leading tokens,
+        # and the interval can't be widened, so the repeat is right-maximal.
+        if length < min_length or right - left + 1 < min_occurrences:
+            return
+        if length < max_length:
+            # Left-maximal unless every occurrence is preceded by the same token.
+            preceding = set()
+            for index in range(left, right + 1):
+                position = positions[index]
+                ids = documents[owners[index]]
+                if position == 0 or ids[position - 1] in separators:
+                    break
+                preceding.add(ids[position - 1])
+                if len(preceding) > 1:
+                    break
+            else:
+                return
+        repeats.append(
+            Repeat(
+                ids=keys[left][:length],
+                occurrences=right - left + 1,
+                documents=len(set(owners[left : right + 1])),
+            )
+        )
+
+    # Standard bottom-up LCP interval traversal; each stack entry is (lcp, left bound).
+    stack = [(0, 0)]
+    for index in range(1, len(keys) + 1):
+        current = lcp[index] if index < len(keys) else 0
+        left = index - 1
+        while current < stack[-1][0]:
+            length, left = stack.pop()
+            emit(length, left, index - 1)
+        if current > stack[-1][0]:
+            stack.append((current, left))
+    return repeats
@@ -11,17 +11,19 @@ import re
 from dataclasses import dataclass
 from typing import Iterator, Sequence
 
-__all__ = ["TokenizedMessage", "SimpleTokenizer"]
+__all__ = ["CachingTokenizer", "TokenizedMessage", "SimpleTokenizer"]
 
 
 _WORD_PATTERN = re.compile(r"[A-Za-z0-9']+")
 _SENTENCE_BOUNDARY = re.compile(r"[.!?]+")
+_WHITESPACE = re.compile(r"\s+")
 _APOSTROPHE_VARIANTS = {
     "\u2018": "'",
     "\u2019": "'",
     "\u2032": "'",
     "\u02bc": "'",
 }
+_APOSTROPHE_TABLE = str.maketrans(_APOSTROPHE_VARIANTS)
 
 
 @dataclass(frozen=True)
@@ -42,8 +44,12 @@ class SimpleTokenizer:
         return [TokenizedMessage(tokens=self.tokenize(text)) for text in messages if text]
 
     def tokenize(self, text: str) -> list[str]:
-        normalized = self._normalize(text)
-        return [match.group(0).lower() for match in _WORD_PATTERN.finditer(normalized)]
+        # Tokens are runs of ASCII word characters, so collapsing whitespace can't
+        # change them. Lowercasing the whole text first is only safe when it is
+        # ASCII: some non-ASCII characters lowercase to ASCII letters (KELVIN SIGN -> "k").
+        if text.isascii():
+            return _WORD_PATTERN.findall(text.lower())
+        return [token.lower() for token in _WORD_PATTERN.findall(text.translate(_APOSTROPHE_TABLE))]
 
     def sentences(self, text: str) -> Iterator[str]:
         normalized = self._normalize(text)
@@ -59,7 +65,33 @@ class SimpleTokenizer:
 
     def _normalize(self, text: str) -> str:
         # Replace smart quotes/apostrophes with straight ASCII quotes
-        normalized = "".join(_APOSTROPHE_VARIANTS.get(ch, ch) for ch in text)
+        normalized = text.translate(_APOSTROPHE_TABLE)
         # Collapse whitespace to keep window sizes predictable
-        normalized = re.sub(r"\s+", " ", normalized)
+        normalized = _WHITESPACE.sub(" ", normalized)
         return normalized.strip()
+
+
+class CachingTokenizer(SimpleTokenizer):
+    """
+    `SimpleTokenizer` that tokenizes each distinct text once.
+
+    Share one instance between every consumer of a run (phrase extraction,
+    word usage, n-gram breakdowns) and `clear` it afterwards. Returned token
+    lists are shared between callers and must not be mutated.
+    """
+
+    def __init__(self) -> None:
+        self._cache: dict[str, list[str]] = {}
+
+    def tokenize(self, text: str) -> list[str]:
+        tokens = self._cache.get(text)
+        if tokens is None:
+            tokens = self._cache[text] = super().tokenize(text)
+        return tokens
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __getstate__(self) -> dict:
+        # Worker processes start with an empty cache instead of a copy of it.
+        return {"_cache": {}}
@@ -0,0 +1,193 @@
+"""
+Precomputed message-count rollups for temporal statistics.
+
+The analyzer used to rebuild its own per-date and per-hour dictionaries for
+every section (volume, temporal distributions, streaks, contact days, the top
+conversation deep dive). `ActivityCube` materializes the counts once, keyed by
+conversation × local day × hour × direction, and every section derives what it
+needs from it with cheap reductions over the (much smaller) set of cells.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from datetime import date, datetime
+from heapq import merge
+from typing import Callable, Iterable, Iterator, Mapping, Sequence
+
+from .models import Conversation
+
+__all__ = ["ActivityCube", "RECEIVED", "SENT"]
+
+RECEIVED = 0
+SENT = 1
+HOURS = 24
+DIRECTIONS = 2
+# Local dates can spill one day either side of the (UTC) export year.
+DAY_SLOTS = 368
+
+
+class ActivityCube:
+    """
+    Sparse count cube over conversation × local day × hour × direction.
+
+    Each conversation stores two parallel `array("I")` columns: sorted packed
+    cell ids and their counts. A cell id packs ``(day * 24 + hour) * 2 +
+    direction`` where ``day`` is the local date offset from Dec 31 of the
+    previous year. A dense block would need ~17.6k slots per conversation, while
+    real conversations only touch a few hundred cells.
+    """
+
+    def __init__(self, year: int, cells: dict[str, tuple[array, array]]) -> None:
+        self.year = year
+        self._cells = cells
+        self._base_ordinal = date(year, 1, 1).toordinal() - 1
+        self._dates = [date.fromordinal(self._base_ordinal + day) for day in range(DAY_SLOTS)]
+
+    @classmethod
+    def build(
+        cls,
+        conversations: Mapping[str, Conversation],
+        *,
+        year: int,
+        to_local: Callable[[datetime], datetime],
+    ) -> "ActivityCube":
+        """Count every in-year, non-context message in a single pass."""
+
+        base_ordinal = date(year, 1, 1).toordinal() - 1
+        cells: dict[str, tuple[array, array]] = {}
+        for key, conversation in conversations.items():
+            counts: Counter[int] = Counter()
+            for message in conversation.messages:
+                if getattr(message, "is_context_only", False):
+                    continue
+                if message.timestamp.year != year:
+                    continue
+                local_time = to_local(message.timestamp)
+                day = local_time.toordinal() - base_ordinal
+                direction = SENT if message.is_from_me else RECEIVED
+                counts[(day * HOURS + local_time.hour) * DIRECTIONS + direction] += 1
+            if counts:
+                ordered = sorted(counts)
+                cells[key] = (array("I", ordered), array("I", [counts[c] for c in ordered]))
+        return cls(year, cells)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._cells
+
+    def keys(self) -> Iterable[str]:
+        return self._cells.keys()
+
+    def iter_cells(
+        self, keys: Iterable[str] | None = None
+    ) -> Iterator[tuple[str, int, int, int, int]]:
+        """Yield ``(key, day, hour, direction, count)`` for every populated cell."""
+
+        for key in self._cells if keys is None else keys:
+            columns = self._cells.get(key)
+            if columns is None:
+                continue
+            cell_ids, counts = columns
+            for cell, count in zip(cell_ids, counts):
+                slot, direction = divmod(cell, DIRECTIONS)
+                day, hour = divmod(slot, HOURS)
+                yield key, day, hour, direction, count
+
+    def date_for(self, day: int) -> date:
+        return self._dates[day]
+
+    def conversation_totals(self, key: str) -> tuple[int, int]:
+        """Return ``(received, sent)`` counts for one conversation."""
+
+        totals = [0, 0]
+        columns = self._cells.get(key)
+        if columns is not None:
+            for cell, count in zip(*columns):
+                totals[cell % DIRECTIONS] += count
+        return totals[RECEIVED], totals[SENT]
+
+    def totals_by_day(self, keys: Iterable[str] | None = None) -> dict[date, list[int]]:
+        """Return ``{local_date: [received, sent]}`` ordered by date."""
+
+        days: dict[int, list[int]] = {}
+        for _, day, _, direction, count in self.iter_cells(keys):
+            bucket = days.get(day)
+            if bucket is None:
+                bucket = days[day] = [0, 0]
+            bucket[direction] += count
+        return {self._dates[day]: days[day] for day in sorted(days)}
+
+    def totals_by_hour(
+        self, keys: Iterable[str] | None = None, direction: int | None = None
+    ) -> list[list[int]]:
+        """Return a 24-slot ``[received, sent]`` histogram of local hours."""
+
+        hours = [[0, 0] for _ in range(HOURS)]
+        for _, _, hour, cell_direction, count in self.iter_cells(keys):
+            if direction is None or direction == cell_direction:
+                hours[hour][cell_direction] += count
+        return hours
+
+    def totals_by_weekday(
+        self, keys: Iterable[str] | None = None, direction: int | None = None
+    ) -> list[int]:
+        weekdays = [0] * 7
+        for _, day, _, cell_direction, count in self.iter_cells(keys):
+            if direction is None or direction == cell_direction:
+                weekdays[self._dates[day].weekday()] += count
+        return weekdays
+
+    def totals_by_month(
+        self, keys: Iterable[str] | None = None, direction: int | None = None
+    ) -> dict[int, int]:
+        months: Counter[int] = Counter()
+        for _, day, _, cell_direction, count in self.iter_cells(keys):
+            if direction is None or direction == cell_direction:
+                months[self._dates[day].month] += count
+        return dict(sorted(months.items()))
+
+    def active_dates(self, key: str, direction: int | None = None) -> list[date]:
+        """Sorted local dates with at least one message in the conversation."""
+
+        seen: list[int] = []
+        for _, day, _, cell_direction, _ in self.iter_cells((key,)):
+            if direction is not None and direction != cell_direction:
+                continue
+            # Cells are sorted, so repeated days are always adjacent.
+            if not seen or seen[-1] != day:
+                seen.append(day)
+        return [self._dates[day] for day in seen]
+
+    def distinct_per_day(self, groups: Iterable[Sequence[str]], direction: int) -> array:
+        """
+        Count, per day slot, how many groups had at least one message.
+
+        Each group lists the conversation keys belonging to one contact. Days are
+        streamed in order per group and deduplicated with a last-seen-day marker,
+        so memory stays at one counter per day slot however many contacts exist.
+        """
+
+        counts = array("I", [0]) * DAY_SLOTS
+        for keys in groups:
+            streams = [self._days((key,), direction) for key in keys]
+            last_seen = -1
+            for day in streams[0] if len(streams) == 1 else merge(*streams):
+                if day != last_seen:
+                    counts[day] += 1
+                    last_seen = day
+        return counts
+
+    def _days(self, keys: Iterable[str], direction: int) -> Iterator[int]:
+        for _, day, _, cell_direction, _ in self.iter_cells(keys):
+            if cell_direction == direction:
+                yield day
+
+    def heatmap(self, key: str, direction: int | None = None) -> list[list[int]]:
+        """Return a 7×24 weekday (Mon=0) by local hour grid for one conversation."""
+
+        grid = [[0] * HOURS for _ in range(7)]
+        for _, day, hour, cell_direction, count in self.iter_cells((key,)):
+            if direction is None or direction == cell_direction:
+                grid[self._dates[day].weekday()][hour] += count
+        return grid
@@ -27,9 +27,11 @@ class MessageProcessor:
         self._guid_to_message: dict[str, Message] = {}
         self.with_contacts = with_contacts
 
-    def process_year(self, year: int) -> ExportData:
+    def process_year(
+        self, year: int, after_rowid: int | None = None, max_rowid: int | None = None
+    ) -> ExportData:
         logger.debug(f"Processing messages for year {year}")
-        conversations = self._build_conversations(year)
+        conversations = self._build_conversations(year, after_rowid, max_rowid)
         logger.debug(f"Built {len(conversations)} conversations")
 
         # Enrich with contact names if requested
@@ -52,13 +54,15 @@ class MessageProcessor:
             user_name=user_name,
         )
 
-    def _build_conversations(self, year: int) -> dict[str, Conversation]:
+    def _build_conversations(
+        self, year: int, after_rowid: int | None = None, max_rowid: int | None = None
+    ) -> dict[str, Conversation]:
         chat_participants = self.reader.fetch_chat_participants()
         conversations = {}
         message_index = {}
         tapback_queue = []
 
-        for row in self.reader.fetch_messages(year):
+        for row in self.reader.fetch_messages(year, after_rowid=after_rowid, max_rowid=max_rowid):
             chat_id = row["chat_id"]
             if chat_id is None:
                 continue
@@ -224,7 +228,14 @@ class MessageService:
         self.db_path = db_path
         self.with_contacts = with_contacts
 
-    def export_year(self, year: int) -> ExportData:
+    def export_year(
+        self, year: int, after_rowid: int | None = None, max_rowid: int | None = None
+    ) -> ExportData:
+        """
+        Export the year's messages, optionally only those with a ROWID in
+        ``(after_rowid, max_rowid]``. Tapbacks in that range still attach to
+        copies of their (older) parent messages.
+        """
         with DatabaseReader(self.db_path) as reader:
             processor = MessageProcessor(reader, with_contacts=self.with_contacts)
-            return processor.process_year(year)
+            return processor.process_year(year, after_rowid=after_rowid, max_rowid=max_rowid)
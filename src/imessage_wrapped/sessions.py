@@ -0,0 +1,176 @@
+"""
+Per-conversation turn and session index.
+
+Conversation starters/enders, double texts, crashout streaks, cliffhangers and
+ghost detection all walk the same ordered message list looking for sender runs
+or silence-separated sessions. `ConversationSessions` derives those structures
+once per conversation and stores them as compact arrays so each section only
+has to query them.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, Mapping
+
+from .models import Conversation, Message
+
+__all__ = ["ConversationSessions", "SessionIndex", "SESSION_GAP"]
+
+SESSION_GAP = timedelta(hours=6)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(timestamp: datetime) -> int:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+@dataclass
+class ConversationSessions:
+    """
+    Ordered in-year messages of one conversation plus derived run/session arrays.
+
+    Attributes:
+        conversation: The source conversation.
+        messages: In-year, non-context messages sorted by timestamp.
+        timestamps: Message timestamps in microseconds since the Unix epoch.
+        gaps: Microseconds since the previous message (0 for the first one).
+        run_starts: Index of the first message of every same-sender turn.
+        run_lengths: Number of messages in every same-sender turn.
+        session_starts: Index of the first message of every session. A new
+            session begins after a silence of `session_gap` or a date change.
+    """
+
+    conversation: Conversation
+    messages: list[Message]
+    timestamps: array
+    gaps: array
+    run_starts: array
+    run_lengths: array
+    session_starts: array
+
+    @classmethod
+    def build(
+        cls,
+        conversation: Conversation,
+        year: int,
+        *,
+        session_gap: timedelta = SESSION_GAP,
+    ) -> "ConversationSessions":
+        messages = [
+            msg
+            for msg in conversation.messages
+            if not getattr(msg, "is_context_only", False) and msg.timestamp.year == year
+        ]
+        messages.sort(key=lambda m: m.timestamp)
+
+        gap_limit = session_gap // _MICROSECOND
+        timestamps = array("q")
+        gaps = array("q")
+        run_starts = array("I")
+        run_lengths = array("I")
+        session_starts = array("I")
+
+        previous: Message | None = None
+        for idx, message in enumerate(messages):
+            micros = _to_micros(message.timestamp)
+            timestamps.append(micros)
+            if previous is None:
+                gaps.append(0)
+                run_starts.append(idx)
+                run_lengths.append(1)
+                session_starts.append(idx)
+            else:
+                gap = micros - timestamps[idx - 1]
+                gaps.append(gap)
+                if message.is_from_me == previous.is_from_me:
+                    run_lengths[-1] += 1
+                else:
+                    run_starts.append(idx)
+                    run_lengths.append(1)
+                if gap >= gap_limit or message.timestamp.date() != previous.timestamp.date():
+                    session_starts.append(idx)
+            previous = message
+
+        return cls(
+            conversation=conversation,
+            messages=messages,
+            timestamps=timestamps,
+            gaps=gaps,
+            run_starts=run_starts,
+            run_lengths=run_lengths,
+            session_starts=session_starts,
+        )
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    @property
+    def session_count(self) -> int:
+        return len(self.session_starts)
+
+    def session_ends(self) -> Iterator[int]:
+        """Yield the index of the last message of every session."""
+
+        for start in self.session_starts[1:]:
+            yield start - 1
+        if self.messages:
+            yield len(self.messages) - 1
+
+    def runs(self, *, from_me: bool | None = None) -> Iterator[tuple[int, int]]:
+        """Yield ``(start, length)`` for every turn, optionally for one sender."""
+
+        for start, length in zip(self.run_starts, self.run_lengths):
+            if from_me is None or self.messages[start].is_from_me == from_me:
+                yield start, length
+
+    def summary(self) -> dict[str, Any]:
+        """Session and turn statistics for this conversation."""
+
+        you_started = sum(1 for idx in self.session_starts if self.messages[idx].is_from_me)
+        you_ended = sum(1 for idx in self.session_ends() if self.messages[idx].is_from_me)
+        total_sessions = self.session_count
+        return {
+            "message_count": len(self.messages),
+            "total_sessions": total_sessions,
+            "you_started": you_started,
+            "they_started": total_sessions - you_started,
+            "you_ended": you_ended,
+            "they_ended": total_sessions - you_ended,
+            "turns": len(self.run_starts),
+            "longest_turn": max(self.run_lengths, default=0),
+        }
+
+
+class SessionIndex:
+    """Lazily built `ConversationSessions` for every conversation of an export."""
+
+    def __init__(
+        self,
+        conversations: Mapping[str, Conversation],
+        year: int,
+        *,
+        session_gap: timedelta = SESSION_GAP,
+    ) -> None:
+        self._conversations = conversations
+        self._year = year
+        self._session_gap = session_gap
+        self._cache: dict[str, ConversationSessions] = {}
+
+    def __getitem__(self, key: str) -> ConversationSessions:
+        sessions = self._cache.get(key)
+        if sessions is None:
+            sessions = ConversationSessions.build(
+                self._conversations[key], self._year, session_gap=self._session_gap
+            )
+            self._cache[key] = sessions
+        return sessions
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._conversations
@@ -0,0 +1,141 @@
+"""
+Token-id streams stored in exports in place of message text.
+
+Exports never carry message text, so phrases are normally computed once at
+export time and can't be recomputed with different settings afterwards. With
+token streams enabled, every message's `SimpleTokenizer` tokens are written
+to the export as integer ids (``Message.token_ids``) and the id -> token table
+goes to a local sidecar (``export.jsonl.vocab.json``) that is never part of the
+export itself. `PhraseExtractor` and the per-conversation word and phrase
+breakdowns can then run from the export plus its vocabulary alone.
+
+Ids are dense (first-seen order) by default. A salted vocabulary derives each
+id from a keyed BLAKE2b digest of the token instead, so an export shared
+without its vocabulary file can't be decoded by guessing words and hashing
+them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable
+
+from .models import ExportData
+from .phrases.tokenizer import SimpleTokenizer
+from .streams import create_temp_file
+
+__all__ = [
+    "VOCABULARY_SUFFIX",
+    "TokenVocabulary",
+    "attach_token_ids",
+    "vocabulary_path_for",
+]
+
+VOCABULARY_SUFFIX = ".vocab.json"
+VOCABULARY_VERSION = 1
+SALT_BYTES = 16
+HASHED_ID_BYTES = 6
+
+
+def vocabulary_path_for(export_path: str | Path) -> Path:
+    export_path = Path(export_path)
+    return export_path.with_name(export_path.name + VOCABULARY_SUFFIX)
+
+
+class TokenVocabulary:
+    """Bidirectional token <-> id table, optionally with salted hashed ids."""
+
+    def __init__(self, salt: bytes | None = None) -> None:
+        self.salt = salt
+        self._ids: dict[str, int] = {}
+        self._tokens: dict[int, str] = {}
+
+    @classmethod
+    def salted(cls) -> TokenVocabulary:
+        return cls(salt=os.urandom(SALT_BYTES))
+
+    @property
+    def hashed(self) -> bool:
+        return self.salt is not None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def encode(self, tokens: Iterable[str]) -> list[int]:
+        ids = self._ids
+        return [ids[token] if token in ids else self._add(token) for token in tokens]
+
+    def decode(self, ids: Iterable[int]) -> list[str]:
+        tokens = self._tokens
+        try:
+            return [tokens[token_id] for token_id in ids]
+        except KeyError as e:
+            raise ValueError(f"Token id {e.args[0]} is not in the vocabulary") from None
+
+    def _add(self, token: str) -> int:
+        if self.salt is None:
+            token_id = len(self._ids)
+        else:
+            digest = hashlib.blake2b(
+                token.encode("utf-8"), digest_size=HASHED_ID_BYTES, key=self.salt
+            ).digest()
+            token_id = int.from_bytes(digest, "little")
+            if token_id in self._tokens:
+                raise ValueError(
+                    f"Token id collision between {self._tokens[token_id]!r} and {token!r}; "
+                    "rebuild the export to draw a new salt"
+                )
+        self._ids[token] = token_id
+        self._tokens[token_id] = token
+        return token_id
+
+    def save(self, path: str | Path) -> None:
+        """Atomically write the vocabulary (and salt) as JSON."""
+
+        path = Path(path)
+        payload = {
+            "version": VOCABULARY_VERSION,
+            "salt": self.salt.hex() if self.salt is not None else None,
+            "tokens": list(self._ids),
+        }
+        if self.salt is not None:
+            payload["ids"] = list(self._ids.values())
+        fd, temp_name = create_temp_file(path)
+        try:
+            with open(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path: str | Path) -> TokenVocabulary:
+        with open(path, encoding="utf-8") as handle:
+            payload = json.load(handle)
+        if not isinstance(payload, dict) or payload.get("version") != VOCABULARY_VERSION:
+            raise ValueError(f"Unsupported token vocabulary: {path}")
+        salt = payload["salt"]
+        vocabulary = cls(salt=bytes.fromhex(salt) if salt is not None else None)
+        tokens = payload["tokens"]
+        ids = payload["ids"] if salt is not None else range(len(tokens))
+        vocabulary._ids = dict(zip(tokens, ids))
+        vocabulary._tokens = dict(zip(ids, tokens))
+        if len(vocabulary._ids) != len(tokens) or len(vocabulary._tokens) != len(tokens):
+            raise ValueError(f"Corrupt token vocabulary: {path}")
+        return vocabulary
+
+
+def attach_token_ids(
+    data: ExportData, vocabulary: TokenVocabulary, tokenizer: SimpleTokenizer | None = None
+) -> None:
+    """Set ``token_ids`` on every message of ``data`` that has non-blank text."""
+
+    tokenizer = tokenizer or SimpleTokenizer()
+    for conv in data.conversations.values():
+        for msg in conv.messages:
+            if msg.text and msg.text.strip():
+                msg.token_ids = vocabulary.encode(tokenizer.tokenize(msg.text))